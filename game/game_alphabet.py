@@ -0,0 +1,100 @@
+import unicodedata
+
+# Letters of each supported language, lower case, in display order. Every
+# other character either folds onto one of them (upper case through
+# casefold(), accented forms onto their base letter unless the language
+# lists them as letters of their own, like Spanish ñ or German ä) or is not
+# a letter at all: spaces, hyphens and the like are never guessed and are
+# shown from the start of a game.
+LANGUAGES = {
+    "en": "abcdefghijklmnopqrstuvwxyz",
+    "fr": "abcdefghijklmnopqrstuvwxyz",
+    "es": "abcdefghijklmnñopqrstuvwxyz",
+    "de": "abcdefghijklmnopqrstuvwxyzäöüß",
+    "el": "αβγδεζηθικλμνξοπρστυφχψω",
+    "ru": "абвгдеёжзийклмнопрстуфхцчшщъыьэюя",
+}
+DEFAULT_LANGUAGE = "en"
+MAX_LETTERS = 64  # guessed and required letters travel as u64 masks
+
+# Code points searched for upper case and accented forms of the letters:
+# ASCII, Latin-1 and Latin Extended-A/B, Greek and Cyrillic, Latin Extended
+# Additional and Greek Extended
+_SCAN = (range(0x20, 0x250), range(0x370, 0x530), range(0x1E00, 0x2000))
+
+
+def _fold(ch, letters):
+    folded = ch.casefold()
+    if folded in letters:
+        return folded
+    lower = ch.lower()
+    if lower in letters:
+        return lower  # e.g. ß, whose casefold() is "ss"
+    base = unicodedata.normalize("NFD", lower)[0]
+    return base if base in letters else None
+
+
+class Alphabet:
+    # One language's letters and the tables derived from them, built once
+    # when the language is first used:
+    #   lookup: any character that counts as a letter -> (letter, bit);
+    #           validating a guess is one lookup
+    #   bits:   letter -> bit
+    #   folds:  str.translate table turning text into its letters
+    #   codes:  code point -> letter index, for code-level scans
+    def __init__(self, language, letters):
+        if len(letters) > MAX_LETTERS:
+            raise ValueError(f"alphabet '{language}' has more than {MAX_LETTERS} letters")
+        self.language = language
+        self.letters = letters
+        self.bits = {letter: 1 << i for i, letter in enumerate(letters)}
+        self.all_letters = (1 << len(letters)) - 1
+
+        letter_set = set(letters)
+        candidates = {ord(ch) for ch in letters + letters.upper()}
+        for block in _SCAN:
+            candidates.update(block)
+        self.lookup = {}
+        self.folds = {}
+        self.codes = {}
+        for code in sorted(candidates):
+            ch = chr(code)
+            letter = _fold(ch, letter_set)
+            if letter is None:
+                continue
+            self.lookup[ch] = (letter, self.bits[letter])
+            self.codes[code] = letters.index(letter)
+            if ch != letter:
+                self.folds[code] = letter
+
+    def __repr__(self):
+        return f"Alphabet({self.language!r})"
+
+    def fold(self, text):
+        # Letters folded onto the alphabet; other characters unchanged
+        return text.translate(self.folds)
+
+    def letters_mask(self, text):
+        mask = 0
+        lookup = self.lookup
+        for ch in text:
+            entry = lookup.get(ch)
+            if entry is not None:
+                mask |= entry[1]
+        return mask
+
+    def mask_letters(self, mask):
+        return [letter for letter, bit in self.bits.items() if mask & bit]
+
+
+_alphabets = {}
+
+
+def get_alphabet(language=DEFAULT_LANGUAGE):
+    alphabet = _alphabets.get(language)
+    if alphabet is None:
+        letters = LANGUAGES.get(language)
+        if letters is None:
+            raise ValueError(f"unknown language '{language}'")
+        alphabet = _alphabets[language] = Alphabet(language, letters)
+    return alphabet
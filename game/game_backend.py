@@ -1,62 +1,102 @@
+import argparse
+import getpass
 import sys
-import random
+import time
+
+STARTED = time.perf_counter()
+
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QLabel, QLineEdit, QPushButton,
-    QVBoxLayout, QHBoxLayout, QTextEdit, QFrame
+    QApplication, QWidget, QLabel, QLineEdit, QPushButton, QComboBox, QCheckBox,
+    QVBoxLayout, QHBoxLayout
 )
-
 from PyQt5.QtGui import QFont
-
-from game_frontend import SnowmanDrawing
+from PyQt5.QtCore import QObject, QEvent
+
+from game_frontend import SnowmanDrawing, MessageView, AlphabetTracker, HintRunner
+from game_words import load_word_bank
+from game_scheduler import WordScheduler, STATE_PATH
+from game_engine import GameEngine, INVALID, REPEAT, FINISHED, CORRECT, PLAYING, WON, LOST
+
+IMPORTED = time.perf_counter()
+
+# One stylesheet for the whole window, parsed once when it is set
+STYLESHEET = """
+    QWidget {
+        background: qlineargradient(
+            spread:pad, x1:0, y1:0, x2:1, y2:1,
+            stop:0 #e0f7fa, stop:1 #a7ffeb
+        );
+    }
+    QLineEdit {
+        border: 2px solid #00acc1;
+        border-radius: 10px;
+        padding: 6px;
+        font-size: 16px;
+        background: #ffffff;
+    }
+    QPushButton {
+        color: white;
+        font-weight: bold;
+        border-radius: 10px;
+        padding: 8px;
+    }
+    QPushButton#guessButton {
+        background-color: #26c6da;
+    }
+    QPushButton#guessButton:hover {
+        background-color: #00acc1;
+    }
+    QPushButton#hintButton {
+        background-color: #ffa726;
+    }
+    QPushButton#hintButton:hover {
+        background-color: #fb8c00;
+    }
+    QPushButton#newGameButton {
+        background-color: #66bb6a;
+    }
+    QPushButton#newGameButton:hover {
+        background-color: #43a047;
+    }
+    QComboBox {
+        border: 2px solid #00acc1;
+        border-radius: 10px;
+        padding: 6px;
+        background: #ffffff;
+    }
+    QListView {
+        background-color: #f1f8e9;
+        border: 2px solid #c5e1a5;
+        border-radius: 10px;
+        padding: 6px;
+        font-size: 14px;
+    }
+"""
 
 class SnowmanGame(QWidget):
-    def __init__(self):
+    # stats: where finished games are recorded; True for the default
+    # database (game_stats.STATS_PATH), a path, or None to record nothing
+    # decks: where deck positions are kept between runs, or None to keep
+    # them in memory only
+    def __init__(self, stats=True, decks=STATE_PATH):
         super().__init__()
         self.setWindowTitle("Don't Let Snowman Melt")
         self.setGeometry(100, 100, 800, 500)
 
-        self.word_bank = {
-            "Animals": [
-                "elephant", "giraffe", "kangaroo", "dolphin", "cheetah",
-                "penguin", "butterfly", "squirrel", "rhinoceros", "chimpanzee",
-                "crocodile", "flamingo", "chameleon", "hedgehog", "jellyfish",
-                "leopard", "nightingale", "ostrich", "toucan", "walrus"
-            ],
-            "Countries": [
-                "australia", "brazil", "canada", "denmark", "egypt",
-                "france", "germany", "india", "japan", "mexico",
-                "netherlands", "new zealand", "norway", "russia", "spain",
-                "thailand", "turkey", "united kingdom", "united states", "vietnam"
-            ],
-            "Fruits & Vegetables": [
-                "apple", "banana", "carrot", "grape", "broccoli",
-                "mango", "orange", "potato", "strawberry", "tomato",
-                "watermelon", "zucchini", "pineapple", "cucumber", "avocado",
-                "blueberry", "cherry", "lettuce", "mushroom", "pear"
-            ],
-            "Occupations": [
-                "teacher", "doctor", "engineer", "artist", "chef",
-                "pilot", "scientist", "firefighter", "police officer", "programmer",
-                "journalist", "architect", "musician", "lawyer", "nurse",
-                "veterinarian", "electrician", "plumber", "accountant", "baker"
-            ],
-            "Sports": [
-                "basketball", "soccer", "tennis", "baseball", "golf",
-                "volleyball", "swimming", "cricket", "badminton", "athletics",
-                "boxing", "cycling", "fencing", "gymnastics", "hockey",
-                "judo", "rugby", "skiing", "surfing", "table tennis"
-            ]
-        }
-
-        self.setStyleSheet("""
-            QWidget {
-                background: qlineargradient(
-                    spread:pad, x1:0, y1:0, x2:1, y2:1,
-                    stop:0 #e0f7fa, stop:1 #a7ffeb
-                );
-            }
-        """)
+        self.word_bank = load_word_bank()
 
+        self.setStyleSheet(STYLESHEET)
+
+        self.scheduler = WordScheduler(self.word_bank, state_path=decks)
+        self.engine = GameEngine(self.word_bank, scheduler=self.scheduler)
+        self.difficulty_index = None  # built on first use, see set_difficulty
+        self.hints = None  # HintRunner, created on the first hint
+        self.recorder = None  # game_replay.Recorder when rounds are recorded
+        self.round = None  # (seed, category, word, evil) of the current round
+        self.round_guesses = []
+        self.round_started = 0.0
+        self.stats_path = stats
+        self.stats = None  # game_stats.StatsStore, opened when the first game ends
 
         self.setup_ui()
         self.new_game()
@@ -84,68 +124,43 @@ class SnowmanGame(QWidget):
         left_layout.addWidget(self.input_box)
         self.input_box.returnPressed.connect(self.handle_guess)  # Guess on Enter key
 
-        self.input_box.setStyleSheet("""
-            QLineEdit {
-                border: 2px solid #00acc1;
-                border-radius: 10px;
-                padding: 6px;
-                font-size: 16px;
-                background: #ffffff;
-            }
-        """)
-
+        guess_row = QHBoxLayout()
         self.submit_button = QPushButton("Guess")
-        left_layout.addWidget(self.submit_button)
+        self.submit_button.setObjectName("guessButton")
+        guess_row.addWidget(self.submit_button, 3)
         self.submit_button.clicked.connect(self.handle_guess)
 
-        self.submit_button.setStyleSheet("""
-            QPushButton {
-                background-color: #26c6da;
-                color: white;
-                font-weight: bold;
-                border-radius: 10px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #00acc1;
-            }
-        """)
+        self.hint_button = QPushButton("Hint")
+        self.hint_button.setObjectName("hintButton")
+        guess_row.addWidget(self.hint_button, 1)
+        self.hint_button.clicked.connect(self.request_hint)
+        left_layout.addLayout(guess_row)
 
         self.new_game_button = QPushButton("New Game")
+        self.new_game_button.setObjectName("newGameButton")
         left_layout.addWidget(self.new_game_button)
         self.new_game_button.clicked.connect(self.new_game)
 
-        self.new_game_button.setStyleSheet("""
-            QPushButton {
-                background-color: #66bb6a;
-                color: white;
-                font-weight: bold;
-                border-radius: 10px;
-                padding: 8px;
-            }
-            QPushButton:hover {
-                background-color: #43a047;
-            }
-        """)
-
-        self.message_box = QTextEdit()
-        self.message_box.setReadOnly(True)
-        left_layout.addWidget(self.message_box)
+        self.difficulty_box = QComboBox()
+        self.difficulty_box.addItems(["Any", "Easy", "Medium", "Hard"])
+        left_layout.addWidget(self.difficulty_box)
+        self.difficulty_box.currentTextChanged.connect(self.set_difficulty)
 
-        self.message_box.setStyleSheet("""
-            QTextEdit {
-                background-color: #f1f8e9;
-                border: 2px solid #c5e1a5;
-                border-radius: 10px;
-                padding: 6px;
-                font-size: 14px;
-            }
-        """)
+        self.evil_box = QCheckBox("Evil mode (the word dodges your guesses)")
+        left_layout.addWidget(self.evil_box)
+        self.evil_box.toggled.connect(self.set_evil)
+
+        self.message_box = MessageView()
+        left_layout.addWidget(self.message_box)
 
         self.guessed_letters_label = QLabel("Guessed Letters: ")
         self.guessed_letters_label.setFont(QFont("Segoe UI", 12))
         left_layout.addWidget(self.guessed_letters_label)
 
+        self.alphabet = AlphabetTracker()
+        left_layout.addWidget(self.alphabet)
+        self.alphabet.letterClicked.connect(self.guess_letter)  # Guess by clicking a letter
+
         # Right section (Hangman drawing area)
         self.hangman_area = SnowmanDrawing()
         self.hangman_area.setMinimumWidth(300)
@@ -157,65 +172,223 @@ class SnowmanGame(QWidget):
 
 
     def new_game(self):
-        self.category, words = random.choice(list(self.word_bank.items()))
-        self.word = random.choice(words)
-        self.guessed_letters = set()
-        self.wrong_guesses = 0
-        self.max_wrong = 7
-
-        self.category_label.setText(f"Category: {self.category}")
+        self.finish_round()
+        self.engine.new_game()
+        # The scheduler picks the word, so there is no seed to record;
+        # replays start from the recorded word
+        self.round = (0, self.engine.category, self.engine.word, self.evil_box.isChecked())
+        self.round_guesses = []
+        self.round_started = time.monotonic()
+        try:
+            self.scheduler.save()
+        except OSError:
+            pass  # deck positions are a convenience; never block a game on them
+
+        self.category_label.setText(f"Category: {self.engine.category}")
         self.update_word_display()
         self.message_box.clear()
         self.submit_button.setEnabled(True)
+        self.hint_button.setEnabled(True)
         self.input_box.setEnabled(True)
-        self.guessed_letters_label.setText("Guessed Letters: ")
-        self.hangman_area.set_wrong_guesses(self.wrong_guesses)  # reset drawing
+        self.alphabet.set_letters(self.engine.alphabet.letters)
+        self.alphabet.setEnabled(True)
+        self.hangman_area.set_wrong_guesses(self.engine.wrong_guesses)  # reset drawing
         self.hangman_area.reset()  # Reset snowman to full
 
 
+    def set_difficulty(self, band):
+        if band == "Any":
+            self.engine.scheduler = self.scheduler
+        else:
+            from game_difficulty import DifficultyIndex, BandPicker
+            if self.difficulty_index is None:
+                self.difficulty_index = DifficultyIndex.build(self.word_bank)
+            self.engine.scheduler = BandPicker(self.difficulty_index, band.lower())
+        self.new_game()
+
+    def finish_round(self):
+        if self.recorder is not None and self.round is not None and self.round_guesses:
+            seed, category, word, evil = self.round
+            engine = self.engine
+            self.recorder.record(seed, category, word, self.round_guesses, engine.max_wrong, evil,
+                                 engine.status, engine.wrong_guesses)
+        self.round = None
+
+    def set_evil(self, evil):
+        self.finish_round()  # while the round's engine is still in place
+        scheduler = self.engine.scheduler
+        if evil:
+            from game_evil import EvilEngine
+            self.engine = EvilEngine(self.word_bank, scheduler=scheduler)
+        else:
+            self.engine = GameEngine(self.word_bank, scheduler=scheduler)
+        self.new_game()
+
     def update_word_display(self):
-        display = ' '.join([letter if letter in self.guessed_letters else '_' for letter in self.word])
-        self.word_display.setText(display)
+        self.word_display.setText(self.engine.display)
 
     def handle_guess(self):
-        letter = self.input_box.text().lower()
+        letter = self.input_box.text()
         self.input_box.clear()
+        self.guess_letter(letter)
 
-        if not letter.isalpha() or len(letter) != 1:
+    def guess_letter(self, letter):
+        self.round_guesses.append(letter)
+        result = self.engine.guess(letter)
+
+        if result.outcome == INVALID:
             self.message_box.append("❗ Please enter a single letter.")
             return
 
-        if letter in self.guessed_letters:
+        if result.outcome == REPEAT:
             self.message_box.append("🔁 You already guessed that letter.")
             return
 
-        self.guessed_letters.add(letter)
-        self.guessed_letters_label.setText("Guessed Letters: " + ', '.join(sorted(self.guessed_letters)))
+        if result.outcome == FINISHED:
+            return
 
-        if letter in self.word:
-            self.message_box.append(f"✅ Good guess: {letter}")
+        if result.outcome == CORRECT:
+            self.alphabet.set_state(result.letter, AlphabetTracker.CORRECT)
+            self.message_box.append(f"✅ Good guess: {result.letter}")
         else:
-            self.wrong_guesses += 1
-            self.message_box.append(f"❌ Wrong guess: {letter}")
-            self.hangman_area.set_wrong_guesses(self.wrong_guesses)
+            self.alphabet.set_state(result.letter, AlphabetTracker.WRONG)
+            self.message_box.append(f"❌ Wrong guess: {result.letter}")
+            self.hangman_area.set_wrong_guesses(self.engine.wrong_guesses)
 
         self.update_word_display()
         self.check_game_status()
 
+    def request_hint(self):
+        if self.hints is None:
+            from game_hints import HintEngine
+            self.hints = HintRunner(HintEngine(self.word_bank), self)
+            self.hints.hintReady.connect(self.show_hint)
+        self.hints.request(self.engine.category, self.engine.pattern, self.engine.guessed)
+
+    def show_hint(self, category, pattern, guessed, letter):
+        # Drop answers for a state the player has already left
+        engine = self.engine
+        if (category, pattern, guessed) != (engine.category, engine.pattern, engine.guessed) or engine.status != PLAYING:
+            return
+        if letter:
+            self.message_box.append(f"💡 Hint: try '{letter}'")
+        else:
+            self.message_box.append("💡 No hint for this one.")
+
     def check_game_status(self):
-        if all(letter in self.guessed_letters for letter in self.word):
-            self.word_display.setText(' '.join(self.word))  # Show full word on win
+        if self.engine.status == WON:
             self.message_box.append("🎉 You won!")
             self.submit_button.setEnabled(False)
+            self.hint_button.setEnabled(False)
             self.input_box.setEnabled(False)
-        elif self.wrong_guesses >= self.max_wrong:
-            self.word_display.setText(' '.join(self.word))  # Show full word on loss
-            self.message_box.append(f"⚠️ You lost! The word was '{self.word}'.")
+            self.alphabet.setEnabled(False)
+        elif self.engine.status == LOST:
+            self.message_box.append(f"⚠️ You lost! The word was '{self.engine.word}'.")
             self.submit_button.setEnabled(False)
+            self.hint_button.setEnabled(False)
             self.input_box.setEnabled(False)
+            self.alphabet.setEnabled(False)
+        else:
+            return
+        self.record_result()
 
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    def record_result(self):
+        if self.stats_path is None:
+            return
+        from game_stats import StatsStore, StatsUnavailable
+        if self.stats is None:
+            self.stats = StatsStore() if self.stats_path is True else StatsStore(self.stats_path)
+        try:
+            player = getpass.getuser()
+        except (OSError, KeyError):
+            player = "player"
+        try:
+            self.stats.record(player, self.engine.category, self.engine.status,
+                              self.engine.wrong_guesses, time.monotonic() - self.round_started)
+        except StatsUnavailable as e:
+            print(f"stats: {e}; not recording games", file=sys.stderr)
+            self.close_stats()
+            self.stats_path = None
+
+    def close_stats(self):
+        if self.stats is not None:
+            self.stats.close()
+            self.stats = None
+
+class FirstPaintProbe(QObject):
+    # Reports startup timings once the window has painted for the first time
+    def __init__(self, window, started, imported, constructed, budget_ms=None, quit_after=True):
+        super().__init__(window)
+        self.started = started
+        self.imported = imported
+        self.constructed = constructed
+        self.budget_ms = budget_ms
+        self.quit_after = quit_after
+        self.over_budget = False
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            # Let this paint finish before reporting
+            QApplication.instance().postEvent(self, QEvent(QEvent.User))
+        return False
+
+    def event(self, event):
+        if event.type() != QEvent.User:
+            return super().event(event)
+        painted = time.perf_counter()
+        total_ms = (painted - self.started) * 1000
+        print(f"imports:         {(self.imported - self.started) * 1000:8.1f} ms", file=sys.stderr)
+        print(f"window created:  {(self.constructed - self.imported) * 1000:8.1f} ms", file=sys.stderr)
+        print(f"first paint:     {(painted - self.constructed) * 1000:8.1f} ms", file=sys.stderr)
+        print(f"total:           {total_ms:8.1f} ms", file=sys.stderr)
+        if self.budget_ms is not None and total_ms > self.budget_ms:
+            print(f"over the {self.budget_ms:.0f} ms startup budget", file=sys.stderr)
+            self.over_budget = True
+        if self.quit_after:
+            QApplication.instance().exit(1 if self.over_budget else 0)
+        return True
+
+
+def main(argv=None, started=STARTED):
+    argv = list(sys.argv if argv is None else argv)
+    parser = argparse.ArgumentParser(description="Play Don't Let Snowman Melt.")
+    parser.add_argument("--profile-startup", action="store_true", help="print startup timings and quit")
+    parser.add_argument("--startup-budget", type=float, metavar="MS",
+                        help="like --profile-startup, exiting with 1 if the first paint takes longer")
+    parser.add_argument("--metrics", metavar="PATH", help="write hot-path metrics here (*.json for JSON)")
+    parser.add_argument("--record", metavar="PATH", help="append every round to this replay file")
+    # Anything else (e.g. -platform, -style) is left for Qt
+    args, qt_args = parser.parse_known_args(argv[1:])
+    profile = args.profile_startup or args.startup_budget is not None
+    budget_ms = args.startup_budget
+    metrics_path = args.metrics
+    record_path = args.record
+
+    app = QApplication(argv[:1] + qt_args)
+    if metrics_path:
+        # Written on exit and on Ctrl+Shift+M; *.json for JSON, else Prometheus text
+        from game_metrics import METRICS, install
+        install(SnowmanGame, SnowmanDrawing)
     window = SnowmanGame()
+    if metrics_path:
+        from PyQt5.QtWidgets import QShortcut
+        from PyQt5.QtGui import QKeySequence
+        QShortcut(QKeySequence("Ctrl+Shift+M"), window, lambda: METRICS.write(metrics_path))
+        app.aboutToQuit.connect(lambda: METRICS.write(metrics_path))
+    if record_path:
+        # Rounds are appended when the next one starts and on exit
+        from game_replay import Recorder
+        window.recorder = Recorder(record_path)
+        app.aboutToQuit.connect(window.finish_round)
+        app.aboutToQuit.connect(window.recorder.close)
+    app.aboutToQuit.connect(window.close_stats)
+    if profile:
+        FirstPaintProbe(window, started, IMPORTED, time.perf_counter(), budget_ms)
     window.show()
-    sys.exit(app.exec_())
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
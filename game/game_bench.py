@@ -0,0 +1,189 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from game_alphabet import LANGUAGES
+from game_engine import GameEngine
+from game_words import WordBank
+
+ALPHABET = LANGUAGES["en"]
+WORD_LENGTHS = (4, 8, 16, 32)
+BANK_SIZES = (100, 10000, 1000000)
+
+
+def synthetic_bank(size, lengths=WORD_LENGTHS, seed=0):
+    rng = random.Random(seed)
+    per_category = max(1, size // len(lengths))
+    return WordBank.from_dict({
+        f"len{length}": [''.join(rng.choices(ALPHABET, k=length)) for _ in range(per_category)]
+        for length in lengths
+    })
+
+
+def measure(func, number, repeat):
+    # Returns per-call timings in microseconds, one per repeat
+    func()  # warm up caches
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return samples
+
+
+def summarize(samples, number):
+    samples = sorted(samples)
+    return {
+        "mean_us": statistics.fmean(samples),
+        "median_us": statistics.median(samples),
+        "min_us": samples[0],
+        "max_us": samples[-1],
+        "calls": number * len(samples),
+    }
+
+
+def bench_engine(results, repeat):
+    for size in BANK_SIZES:
+        engine = GameEngine(synthetic_bank(size))
+        engine.rng.seed(0)
+        results[f"engine.new_game[words={size}]"] = summarize(measure(engine.new_game, 2000, repeat), 2000)
+
+    bank = synthetic_bank(len(WORD_LENGTHS) * 50)
+    order = "etaoinshrdlcumwfgypbvkjxqz"
+    for length in WORD_LENGTHS:
+        engine = GameEngine(bank, max_wrong=len(ALPHABET))
+        words = list(bank[f"len{length}"])
+
+        def round_of_guesses():
+            engine.start(f"len{length}", words[0])
+            for letter in order:
+                engine.guess(letter)
+
+        # one round is 26 guesses; report the cost of a single guess
+        samples = [s / len(order) for s in measure(round_of_guesses, 200, repeat)]
+        results[f"engine.guess[len={length}]"] = summarize(samples, 200 * len(order))
+
+        engine.start(f"len{length}", words[0])
+        for letter in order[:len(order) // 2]:
+            engine.guess(letter)
+        results[f"engine.display[len={length}]"] = summarize(measure(lambda: engine.display, 20000, repeat), 20000)
+        results[f"engine.status[len={length}]"] = summarize(measure(lambda: engine.status, 20000, repeat), 20000)
+
+
+def bench_gui(results, repeat):
+    from PyQt5.QtWidgets import QApplication
+    from PyQt5.QtGui import QImage, QPainter
+    from PyQt5.QtCore import Qt
+
+    from game_frontend import SnowmanDrawing
+    from game_backend import SnowmanGame
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    game = SnowmanGame(stats=None, decks=None)  # keep bench games out of the user's files
+    letters = iter(())
+
+    def handle_guess():
+        nonlocal letters
+        letter = next(letters, None)
+        if letter is None or game.engine.status != "playing":
+            game.new_game()
+            letters = iter(ALPHABET)
+            letter = next(letters)
+        game.input_box.setText(letter)
+        game.handle_guess()
+
+    game.new_game()
+    results["gui.handle_guess"] = summarize(measure(handle_guess, 200, repeat), 200)
+    results["gui.update_word_display"] = summarize(measure(game.update_word_display, 2000, repeat), 2000)
+    results["gui.check_game_status"] = summarize(measure(game.check_game_status, 2000, repeat), 2000)
+
+    drawing = SnowmanDrawing()
+    for width, height in ((300, 400), (1200, 1600)):
+        drawing.resize(width, height)
+        image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+
+        def paint():
+            image.fill(Qt.transparent)
+            painter = QPainter(image)
+            drawing.render(painter)
+            painter.end()
+
+        for melted in (0, 3, 6):
+            drawing.reset()
+            for i in range(melted):
+                drawing.part_scales[drawing.max_parts - 1 - i] = 0.0
+            drawing.part_scales[drawing.max_parts - 1 - melted] = 0.5  # mid-melt part
+            results[f"gui.paintEvent[{width}x{height},melted={melted}]"] = summarize(
+                measure(paint, 100, repeat), 100)
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def compare(results, baseline, threshold):
+    regressions = []
+    for name, row in results.items():
+        old = baseline.get("results", {}).get(name)
+        if old is None:
+            continue
+        change = row["median_us"] / old["median_us"] - 1
+        marker = "REGRESSION" if change > threshold else ""
+        print(f"{name:<45} {old['median_us']:10.2f} -> {row['median_us']:10.2f} us  {change:+7.1%} {marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the engine hot paths and offscreen rendering.")
+    parser.add_argument("-o", "--output", default="bench_output.json")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--no-gui", action="store_true", help="skip the Qt benchmarks")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare against a previous JSON result")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative median slowdown reported as a regression (default 0.15)")
+    args = parser.parse_args(argv)
+
+    results = {}
+    bench_engine(results, args.repeat)
+    if not args.no_gui:
+        bench_gui(results, args.repeat)
+
+    report = {
+        "revision": git_revision(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    else:
+        for name, row in results.items():
+            print(f"{name:<45} {row['median_us']:10.2f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
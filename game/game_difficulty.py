@@ -0,0 +1,189 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import sys
+from bisect import bisect_left
+
+from game_engine import GameEngine, PLAYING, WON
+from game_words import WORDS_DIR, WordBank, load_word_bank
+
+CACHE_PATH = os.path.join(os.path.expanduser("~"), ".snowman_difficulty.json")
+CACHE_VERSION = 3
+
+# Bands over the difficulty percentile (0 = easiest word in the bank)
+BANDS = {
+    "easy": (0.0, 1 / 3),
+    "medium": (1 / 3, 2 / 3),
+    "hard": (2 / 3, float("inf")),
+}
+
+
+def solver_features(word_bank, category, words, max_wrong=7):
+    # [wrong guesses, won] for the solver playing each word
+    from game_solver import Solver
+    solver = Solver(word_bank)
+    engine = GameEngine(word_bank, max_wrong)
+    features = {}
+    for word in words:
+        engine.start(category, word)
+        while engine.status == PLAYING:
+            letter = solver.best_letter(category, engine.pattern, engine.wrong_letters)
+            if letter is None:
+                letter = next(l for l in engine.alphabet.letters if not engine.guessed & engine.alphabet.bits[l])
+            engine.guess(letter)
+        features[word] = [engine.wrong_guesses, engine.status == WON]
+    return features
+
+
+def group_fingerprint(language, words):
+    # The solver's result for a word depends on every word of the same
+    # length in its category, so cached results are kept per such group
+    digest = hashlib.sha1(language.encode("ascii") + b"\0")
+    for word in sorted(words):
+        digest.update(word.encode("utf-8") + b"\n")
+    return digest.hexdigest()
+
+
+def raw_score(word, wrong, won, rarity, max_wrong, alphabet):
+    letters = {ch for ch in alphabet.fold(word) if ch in alphabet.bits}
+    solver = wrong / max_wrong if won else 1.0
+    distinct = len(letters) / max(len(word), 1)  # few repeats = fewer free reveals
+    shortness = 1.0 / max(len(word), 1)           # short words give fewer clues
+    rare = sum(rarity[ch] for ch in letters) / max(len(letters), 1)
+    return 0.4 * solver + 0.25 * rare + 0.2 * distinct + 0.6 * shortness
+
+
+class DifficultyIndex:
+    # Per category: difficulty percentiles in ascending order, with the word
+    # index each one belongs to. Band lookups are two bisections.
+    def __init__(self, word_bank, index):
+        self.word_bank = word_bank
+        self.scores = {name: [s for s, _ in rows] for name, rows in index.items()}
+        self.words = {name: [i for _, i in rows] for name, rows in index.items()}
+
+    @classmethod
+    def build(cls, word_bank, cache_path=CACHE_PATH, max_wrong=7, rebuild=False):
+        if not isinstance(word_bank, WordBank):
+            word_bank = WordBank.from_dict(word_bank)
+        key = word_bank.fingerprint()
+
+        cache = {}
+        if cache_path and not rebuild:
+            try:
+                with open(cache_path) as f:
+                    cache = json.load(f)
+            except (OSError, ValueError):
+                cache = {}
+            if cache.get("version") != CACHE_VERSION or cache.get("max_wrong") != max_wrong:
+                cache = {}
+        if cache.get("fingerprint") == key:
+            return cls(word_bank, cache["index"])
+
+        # Only length groups whose words changed are played by the solver
+        # again: {category: {length: {"fingerprint": ..., "words": {word: features}}}}
+        groups = cache.get("groups", {})
+        live = {}
+        features = {}
+        for name, words in word_bank.items():
+            by_length = {}
+            for word in words:
+                by_length.setdefault(str(len(word)), []).append(word)
+            cached = groups.get(name, {})
+            live[name] = {}
+            known = features[name] = {}
+            for length, group in by_length.items():
+                fingerprint = group_fingerprint(word_bank.language(name), group)
+                entry = cached.get(length)
+                if entry is None or entry["fingerprint"] != fingerprint:
+                    entry = {"fingerprint": fingerprint,
+                             "words": solver_features(word_bank, name, sorted(set(group)), max_wrong)}
+                live[name][length] = entry
+                known.update(entry["words"])
+
+        # Letters of every category's alphabet, counted after folding
+        present = {}
+        total = 0
+        for name, words in word_bank.items():
+            alphabet = word_bank.alphabet(name)
+            for letter in alphabet.letters:
+                present.setdefault(letter, 0)
+            for word in words:
+                total += 1
+                for ch in set(alphabet.fold(word)):
+                    if ch in alphabet.bits:
+                        present[ch] += 1
+        rarity = {ch: -math.log2((count + 1) / (total + 1)) / math.log2(total + 1)
+                  for ch, count in present.items()}
+
+        rows = []
+        for name, words in word_bank.items():
+            known = features[name]
+            alphabet = word_bank.alphabet(name)
+            for i, word in enumerate(words):
+                wrong, won = known[word]
+                rows.append((raw_score(word, wrong, won, rarity, max_wrong, alphabet), name, i))
+
+        # Percentile ranks make the bands comparable across word banks
+        rows.sort()
+        index = {name: [] for name in word_bank.keys()}
+        for rank, (_, name, i) in enumerate(rows):
+            index[name].append((rank / max(len(rows) - 1, 1), i))
+
+        if cache_path:
+            cache = {"version": CACHE_VERSION, "max_wrong": max_wrong, "fingerprint": key,
+                     "groups": live, "index": index}
+            tmp = cache_path + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(cache, f)
+            os.replace(tmp, cache_path)
+        return cls(word_bank, index)
+
+    def band_range(self, category, band):
+        lo, hi = BANDS[band]
+        scores = self.scores[category]
+        return bisect_left(scores, lo), bisect_left(scores, hi)
+
+    def band_size(self, category, band):
+        start, end = self.band_range(category, band)
+        return end - start
+
+    def pick(self, category, band, rng):
+        start, end = self.band_range(category, band)
+        if start == end:
+            return None
+        return self.words[category][rng.randrange(start, end)]
+
+
+class BandPicker:
+    # Word source for GameEngine.scheduler that only deals one band
+    def __init__(self, index, band, rng=None):
+        self.index = index
+        self.band = band
+        self.rng = random.Random() if rng is None else rng
+        self.names = [name for name in index.word_bank.keys() if index.band_size(name, band)]
+        if not self.names:
+            raise ValueError(f"no words in the '{band}' band")
+
+    def next_word(self):
+        category = self.names[self.rng.randrange(len(self.names))]
+        i = self.index.pick(category, self.band, self.rng)
+        return category, self.index.word_bank[category][i]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the word difficulty index.")
+    parser.add_argument("--words", default=WORDS_DIR, help="words directory or compiled word bank")
+    parser.add_argument("--cache", default=CACHE_PATH)
+    parser.add_argument("--rebuild", action="store_true", help="ignore the cache")
+    args = parser.parse_args(argv)
+
+    index = DifficultyIndex.build(load_word_bank(args.words), args.cache, rebuild=args.rebuild)
+    for name in index.word_bank.keys():
+        print(f"{name:<22} " + "  ".join(f"{band} {index.band_size(name, band):>6}" for band in BANDS))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import random
+from collections import namedtuple
+from functools import lru_cache
+
+from game_alphabet import get_alphabet
+from game_words import WordBank
+
+# Game status
+PLAYING = "playing"
+WON = "won"
+LOST = "lost"
+
+# Guess outcomes
+INVALID = "invalid"
+REPEAT = "repeat"
+CORRECT = "correct"
+WRONG = "wrong"
+FINISHED = "finished"
+
+HIDDEN = '_'
+
+GuessResult = namedtuple("GuessResult", ["outcome", "letter", "status", "positions"])
+
+# positions: letter -> positions holding it (accented forms included)
+# required:  letters that must be guessed to win
+# guessable: bitmask of the positions holding letters
+# start:     the pattern before any guess; non-letters are shown as they are
+WordIndex = namedtuple("WordIndex", ["positions", "required", "guessable", "start"])
+
+
+@lru_cache(maxsize=4096)
+def index_word(word, alphabet=None):
+    lookup = (alphabet or get_alphabet()).lookup
+    positions = {}
+    required = guessable = 0
+    start = []
+    for i, ch in enumerate(word):
+        entry = lookup.get(ch)
+        if entry is None:
+            start.append(ch)
+            continue
+        letter, bit = entry
+        required |= bit
+        guessable |= 1 << i
+        positions.setdefault(letter, []).append(i)
+        start.append(HIDDEN)
+    return WordIndex({letter: tuple(p) for letter, p in positions.items()}, required, guessable, ''.join(start))
+
+
+class GameEngine:
+    __slots__ = ("word_bank", "max_wrong", "rng", "scheduler", "category", "word", "alphabet", "index",
+                 "guessed", "wrong_guesses", "status", "_revealed")
+
+    def __init__(self, word_bank, max_wrong=7, rng=None, scheduler=None):
+        if not isinstance(word_bank, WordBank):
+            word_bank = WordBank.from_dict(word_bank)
+        self.word_bank = word_bank
+        self.max_wrong = max_wrong
+        self.rng = random.Random() if rng is None else rng
+        self.scheduler = scheduler  # e.g. game_scheduler.WordScheduler; None picks uniformly
+
+        self.category = None
+        self.word = ""
+        self.alphabet = None  # the category's game_alphabet.Alphabet, set by start()
+        self.index = WordIndex({}, 0, 0, "")
+        self.guessed = 0
+        self.wrong_guesses = 0
+        self.status = PLAYING
+        self._revealed = []
+
+    def new_game(self, seed=None):
+        if seed is not None:
+            self.rng.seed(seed)
+        if self.scheduler is not None:
+            self.start(*self.scheduler.next_word())
+        else:
+            self.start(*self.word_bank.random_word(self.rng))
+
+    def start(self, category, word):
+        self.category = category
+        self.word = word
+        self.alphabet = self.word_bank.alphabet(category)
+        self.index = index_word(word, self.alphabet)
+        self.guessed = 0
+        self.wrong_guesses = 0
+        self.status = PLAYING
+        self._revealed = list(self.index.start)
+        if not self.index.required:
+            self.status = WON  # nothing to guess
+
+    def guess(self, letter):
+        if self.status != PLAYING:
+            return GuessResult(FINISHED, letter, self.status, ())
+
+        # Any case or accented form of a letter counts as the letter
+        entry = self.alphabet.lookup.get(letter)
+        if entry is None:
+            return GuessResult(INVALID, letter, self.status, ())
+        letter, bit = entry
+
+        if self.guessed & bit:
+            return GuessResult(REPEAT, letter, self.status, ())
+
+        self.guessed |= bit
+
+        positions = self.index.positions.get(letter, ())
+        if positions:
+            revealed = self._revealed
+            word = self.word
+            for i in positions:
+                revealed[i] = word[i]
+            outcome = CORRECT
+            if self.index.required & ~self.guessed == 0:
+                self.status = WON
+        else:
+            self.wrong_guesses += 1
+            outcome = WRONG
+            if self.wrong_guesses >= self.max_wrong:
+                self.status = LOST
+
+        return GuessResult(outcome, letter, self.status, positions)
+
+    @property
+    def guessed_letters(self):
+        return self.alphabet.mask_letters(self.guessed)
+
+    @property
+    def wrong_letters(self):
+        return self.alphabet.mask_letters(self.guessed & ~self.index.required)
+
+    @property
+    def pattern(self):
+        # Revealed letters folded onto the alphabet, '_' for hidden ones; the
+        # form the solver, hints and opening book work on
+        return ''.join(self._revealed).translate(self.alphabet.folds)
+
+    @property
+    def display(self):
+        if self.status != PLAYING:
+            return ' '.join(self.word)  # Show full word once the round is over
+        return ' '.join(self._revealed)
@@ -0,0 +1,116 @@
+import numpy as np
+
+from game_engine import (
+    GameEngine, GuessResult, index_word,
+    PLAYING, WON, LOST, INVALID, REPEAT, CORRECT, WRONG, FINISHED,
+)
+from game_solver import encode_category
+
+
+class EvilEngine(GameEngine):
+    # Same interface as GameEngine, but the secret word is never fixed: each
+    # guess splits the remaining candidates by where the letter occurs in
+    # them and keeps the largest family (ties go to the fewest reveals).
+    # `word` is always one member of that family, so it is consistent with
+    # every answer given so far.
+    __slots__ = ("_codes", "_keys", "_category_codes", "_group", "_columns", "_letter_keys", "_rows", "_hidden")
+
+    def __init__(self, word_bank, max_wrong=7, rng=None, scheduler=None):
+        super().__init__(word_bank, max_wrong, rng, scheduler)
+        self._codes = {}
+        self._keys = {}
+        self._category_codes = None
+        self._group = None
+        self._columns = None
+        self._letter_keys = None
+        self._rows = None
+        self._hidden = 0
+
+    def start(self, category, word):
+        # Only the category, the length of the chosen word and where it has
+        # non-letters (shown from the start) are kept
+        codes = self._codes.get(category)
+        if codes is None:
+            codes = self._codes[category] = encode_category(self.word_bank[category],
+                                                            self.word_bank.alphabet(category))
+        super().start(category, word)
+        self._category_codes = codes
+        self._group = codes.groups[len(word)]
+        cached = self._keys.get((category, len(word)))
+        if cached is None:
+            # Position-major copy of the codes so each column is contiguous
+            columns = np.ascontiguousarray(self._group.codes.T)
+            cached = self._keys[category, len(word)] = (columns, {}, bool((columns >= codes.letters).any()))
+        self._columns, self._letter_keys, has_others = cached
+        self._rows = np.arange(len(self._group.words))
+        if has_others:
+            # Candidates must show the same non-letters in the same places
+            chosen = codes.encode([word])[:, None]
+            shown = (self._columns >= codes.letters) | (chosen >= codes.letters)
+            self._rows = np.flatnonzero(((self._columns == chosen) | ~shown).all(axis=0))
+        self._hidden = self.index.guessable
+
+    def _family_keys(self, letter):
+        # Per word of the length group, the bitmask of positions holding the
+        # letter. Computed once per letter and kept for later games.
+        keys = self._letter_keys.get(letter)
+        if keys is None:
+            columns = self._columns
+            length = len(columns)
+            dtype = np.uint16 if length <= 16 else np.uint32 if length <= 32 else np.uint64
+            keys = np.zeros(columns.shape[1], dtype=dtype)
+            code = self._category_codes.code(letter)
+            for i in range(length):
+                keys |= (columns[i] == code).astype(dtype) << dtype(i)
+            self._letter_keys[letter] = keys
+        return keys
+
+    def guess(self, letter):
+        if self.status != PLAYING:
+            return GuessResult(FINISHED, letter, self.status, ())
+
+        entry = self.alphabet.lookup.get(letter)
+        if entry is None:
+            return GuessResult(INVALID, letter, self.status, ())
+        letter, bit = entry
+
+        if self.guessed & bit:
+            return GuessResult(REPEAT, letter, self.status, ())
+
+        self.guessed |= bit
+
+        keys = self._family_keys(letter)[self._rows]
+        if keys.dtype == np.uint16:
+            counts = np.bincount(keys, minlength=1)
+            tied = np.flatnonzero(counts == counts.max())
+        else:
+            values, counts = np.unique(keys, return_counts=True)
+            tied = values[counts == counts.max()]
+        # Of the largest families, the one revealing the fewest positions
+        best = min(tied.tolist(), key=lambda key: (bin(key).count("1"), key))
+
+        self._rows = self._rows[keys == best]
+        self.word = self._group.words[self._rows[0]]
+        self.index = index_word(self.word, self.alphabet)
+
+        if best:
+            positions = tuple(i for i in range(len(self.word)) if best >> i & 1)
+            revealed = self._revealed
+            for i in positions:
+                revealed[i] = self.word[i]
+            self._hidden &= ~best
+            outcome = CORRECT
+            if not self._hidden:
+                self.status = WON
+        else:
+            positions = ()
+            self.wrong_guesses += 1
+            outcome = WRONG
+            if self.wrong_guesses >= self.max_wrong:
+                self.status = LOST
+
+        return GuessResult(outcome, letter, self.status, positions)
+
+    @property
+    def candidates_left(self):
+        return len(self._rows)
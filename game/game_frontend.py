@@ -1,116 +1,633 @@
-from PyQt5.QtWidgets import QWidget
-from PyQt5.QtGui import QPainter, QPen
-from PyQt5.QtCore import Qt, QTimer
+import math
+from collections import OrderedDict, deque
+
+from PyQt5.QtWidgets import QWidget, QListView, QAbstractItemView
+from PyQt5.QtGui import QPainter, QPainterPath, QPen, QPixmap, QColor, QFont, QFontMetrics, QTransform, QStaticText
+from PyQt5.QtCore import (
+    Qt, QObject, QTimer, QElapsedTimer, QAbstractListModel, QModelIndex, QPoint, QPointF, QRect, QRectF,
+    QSize, QRunnable, QThreadPool, pyqtSignal,
+)
+
+from game_engine import PLAYING, WON, LOST
+
+
+def snowman_parts():
+    # Geometry of the seven parts on the drawing_width x drawing_height
+    # canvas, in melt order from the base: (filled path, open path, point
+    # the part shrinks towards, bounds covering the whole melt).
+    def ellipse(x, y, w, h):
+        path = QPainterPath()
+        path.addEllipse(QRectF(x, y, w, h))
+        return path
+
+    def line(x1, y1, x2, y2):
+        path = QPainterPath()
+        path.moveTo(x1, y1)
+        path.lineTo(x2, y2)
+        return path
+
+    face = ellipse(135, 90, 5, 5)
+    face.addEllipse(QRectF(160, 90, 5, 5))
+    smile = QPainterPath()
+    smile.arcMoveTo(QRectF(135, 105, 30, 15), 0)
+    smile.arcTo(QRectF(135, 105, 30, 15), 0, -180)
+    hat = QPainterPath()
+    hat.addRect(QRectF(125, 25, 50, 40))
+
+    empty = QPainterPath()
+    parts = [
+        (ellipse(80, 200, 140, 140), empty, QPointF(150, 340)),  # Base
+        (ellipse(95, 120, 110, 110), empty, QPointF(150, 230)),  # Middle
+        (ellipse(110, 60, 80, 80), empty, QPointF(150, 140)),    # Head
+        (empty, line(110, 170, 60, 140), QPointF(85, 155)),      # Left arm
+        (empty, line(190, 170, 240, 140), QPointF(215, 155)),    # Right arm
+        (face, smile, QPointF(150, 105)),                        # Face
+        (hat, line(110, 65, 190, 65), QPointF(150, 65)),         # Hat
+    ]
+    margin = SnowmanDrawing.pen_width / 2 + 1
+    drop = SnowmanDrawing.melt_drop * (SnowmanDrawing.melt_steps - 1)
+    return [
+        (filled, outline, anchor,
+         filled.boundingRect().united(outline.boundingRect()).adjusted(-margin, -margin, margin, margin + drop))
+        for filled, outline, anchor in parts
+    ]
 
 
 class SnowmanDrawing(QWidget):
+    # The parts at rest are pre-rendered into a layer shared by all
+    # drawings, keyed by (parts at rest, drawing scale, device pixel ratio).
+    # Parts melt top first, so a game passes through only max_parts + 1
+    # layers; the melting part is painted live over its layer. Layers are
+    # limited to layer_cache_bytes in total (a 300x400 layer is ~480 KB).
+    # Layers over a quarter of the budget, i.e. large widgets on HiDPI
+    # screens, are not cached: the parts are painted directly, clipped to
+    # the dirty area.
+    layer_cache_bytes = 16 * 1024 * 1024
+    _layers = OrderedDict()
+    _layer_bytes = 0
+    _parts = None  # snowman_parts(), built on first paint
+
+    # The canvas the geometry is laid out on; it is scaled to fit the
+    # widget, keeping its aspect ratio, and centered
+    drawing_width = 300
+    drawing_height = 400
+    pen_width = 2.5
+
+    # Each melt is melt_steps steps of melt_step_ms; steps are derived from
+    # elapsed time, so a late timer skips frames instead of slowing down.
+    # The melting part sinks melt_drop canvas pixels per step.
+    melt_steps = 10
+    melt_step_ms = 40
+    melt_drop = 6
+    max_parts = 7
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(300, 400)
-        self.max_parts = 7
         self.parts_remaining = self.max_parts
         self.animating = False
         self.melt_step = 0
         self.current_melting = None
         self.part_scales = [1.0] * self.max_parts  # scale of each part (1.0 = full size)
         self.part_y_offset = [0] * self.max_parts
+        self.view = None  # canvas_geometry(), recomputed after a resize
+
+        self.pending_melts = deque()
+        self.melts_scheduled = 0
+        self.melt_started = 0
+        self.clock = QElapsedTimer()
+        self.clock.start()
+        self.timer = None  # created on the first melt, not at startup
+
+    @classmethod
+    def parts(cls):
+        if cls._parts is None:
+            cls._parts = snowman_parts()
+        return cls._parts
 
     def set_wrong_guesses(self, count):
-        if self.animating:
-            return  # prevent overlapping animations
+        # Queue a melt for every part the count says is gone; parts melt in
+        # order, top first, so quick wrong guesses are never lost.
+        count = min(count, self.max_parts)
+        while self.melts_scheduled < count:
+            self.melts_scheduled += 1
+            self.pending_melts.append(self.max_parts - self.melts_scheduled)
 
-        melt_index = self.max_parts - count
-        if melt_index < 0 or melt_index >= self.max_parts:
-            return
+        if self.pending_melts and not self.animating:
+            if self.timer is None:
+                self.timer = QTimer(self)
+                self.timer.setInterval(self.melt_step_ms)
+                self.timer.timeout.connect(self.animate_melt)
+            self.animating = True
+            self.start_melt(self.clock.elapsed())
+            self.timer.start()
 
-        self.current_melting = melt_index
-        self.animating = True
+    def start_melt(self, started):
+        self.current_melting = self.pending_melts.popleft()
+        self.melt_started = started
         self.melt_step = 0
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.animate_melt)
-        self.timer.start(40)  # every 40ms
-
     def animate_melt(self):
-        if self.melt_step < 10:
-            # shrink part by 10% each time
-            self.part_scales[self.current_melting] -= 0.1
-            self.part_y_offset[self.current_melting] += 6
-            self.melt_step += 1
-            self.update()
-        else:
-            # Done melting
+        now = self.clock.elapsed()
+        duration = self.melt_steps * self.melt_step_ms
+
+        # Finish every melt whose time is up; the next one starts when the
+        # previous one should have ended, so a backlog catches up.
+        while now - self.melt_started >= duration:
             self.part_scales[self.current_melting] = 0.0
             self.part_y_offset[self.current_melting] = 0
-            self.animating = False
-            self.current_melting = None
-            self.timer.stop()
-            self.update()
-        
+            self.parts_remaining -= 1
+            self.update_part(self.current_melting)
+            if not self.pending_melts:
+                self.animating = False
+                self.current_melting = None
+                self.timer.stop()
+                return
+            self.start_melt(self.melt_started + duration)
+
+        step = (now - self.melt_started) // self.melt_step_ms
+        if step != self.melt_step:
+            # shrink part by 10% per step
+            self.melt_step = step
+            self.part_scales[self.current_melting] = 1.0 - step / self.melt_steps
+            self.part_y_offset[self.current_melting] = self.melt_drop * step
+            self.update_part(self.current_melting)
+
         # self.melt_sound.play()
-        
+
+    def canvas_geometry(self):
+        # (scale, origin) placing the canvas in the widget
+        if self.view is None:
+            scale = min(self.width() / self.drawing_width, self.height() / self.drawing_height)
+            origin = QPoint(round((self.width() - self.drawing_width * scale) / 2),
+                            round((self.height() - self.drawing_height * scale) / 2))
+            self.view = scale, origin
+        return self.view
+
+    def resizeEvent(self, event):
+        self.view = None
+        super().resizeEvent(event)
+
+    def update_part(self, part):
+        # Invalidates only the area the part covers at any point of its melt
+        scale, origin = self.canvas_geometry()
+        bounds = self.parts()[part][3]
+        self.update(QRectF(origin.x() + bounds.x() * scale, origin.y() + bounds.y() * scale,
+                           bounds.width() * scale, bounds.height() * scale).toAlignedRect())
 
     def paintEvent(self, event):
+        scale, origin = self.canvas_geometry()
+        dirty = QRectF(event.rect())
         painter = QPainter(self)
+        resting = tuple(self.part_scales[i] == 1.0 and not self.part_y_offset[i] for i in range(self.max_parts))
+        layer = self.cached_layer(resting, scale, self.devicePixelRatioF())
+        live = None
+        if layer is not None:
+            painter.drawPixmap(origin, layer)
+            live = [i for i, still in enumerate(resting) if not still]
+            if not live:
+                return
+        painter.translate(origin)
+        painter.scale(scale, scale)
+        self.draw_snowman(painter, QRectF((dirty.x() - origin.x()) / scale, (dirty.y() - origin.y()) / scale,
+                                          dirty.width() / scale, dirty.height() / scale), live)
+
+    def cached_layer(self, resting, scale, dpr):
+        width = math.ceil(self.drawing_width * scale * dpr)
+        height = math.ceil(self.drawing_height * scale * dpr)
+        if width * height * 4 * 4 > self.layer_cache_bytes:
+            return None
+        key = (resting, scale, dpr)
+        layers = SnowmanDrawing._layers
+
+        layer = layers.get(key)
+        if layer is not None:
+            layers.move_to_end(key)
+            return layer
+        layer = QPixmap(width, height)
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.transparent)
+        painter = QPainter(layer)
+        painter.scale(scale, scale)
+        self.draw_snowman(painter, parts=[i for i, still in enumerate(resting) if still])
+        painter.end()
+
+        layers[key] = layer
+        SnowmanDrawing._layer_bytes += width * height * 4
+        while SnowmanDrawing._layer_bytes > self.layer_cache_bytes:
+            _, old = layers.popitem(last=False)
+            SnowmanDrawing._layer_bytes -= old.width() * old.height() * 4
+        return layer
+
+    def draw_snowman(self, painter, visible=None, parts=None):
+        # Paints the parts (all, or the given indices) in canvas coordinates,
+        # skipping those outside `visible`. A melting part is shrunk towards
+        # its anchor and moved down; the pen keeps its width.
         painter.setRenderHint(QPainter.Antialiasing)
-        pen = QPen(Qt.black, 2.5)
+        pen = QPen(Qt.black, self.pen_width)
         painter.setPen(pen)
-        center_x = 150
         painter.setBrush(Qt.white)  # Solid white snowballs
 
+        for i, (filled, outline, anchor, bounds) in enumerate(self.parts()):
+            scale = self.part_scales[i]
+            if scale <= 0 or (parts is not None and i not in parts):
+                continue
+            if visible is not None and not bounds.intersects(visible):
+                continue
+            if scale != 1.0 or self.part_y_offset[i]:
+                melt = QTransform()
+                melt.translate(anchor.x(), anchor.y() + self.part_y_offset[i])
+                melt.scale(scale, scale)
+                melt.translate(-anchor.x(), -anchor.y())
+                filled, outline = melt.map(filled), melt.map(outline)
+            painter.drawPath(filled)
+            painter.strokePath(outline, pen)
 
-        def draw_scaled_ellipse(x, y, w, h, scale, offset_y):
-            if scale > 0:
-                x = int(center_x - w * scale / 2 + x)
-                y = int(y + (1 - scale) * h + offset_y)
-                w = int(w * scale)
-                h = int(h * scale)
-                painter.drawEllipse(x, y, w, h)
-
-        def draw_scaled_line(x1, y1, x2, y2, scale, offset_y):
-            if scale > 0:
-                cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
-                x1 = int(cx + (x1 - cx) * scale)
-                y1 = int(cy + (y1 - cy) * scale + offset_y)
-                x2 = int(cx + (x2 - cx) * scale)
-                y2 = int(cy + (y2 - cy) * scale + offset_y)
-                painter.drawLine(x1, y1, x2, y2)
-
-
-        if self.part_scales[0] > 0:
-            draw_scaled_ellipse(0, 200, 140, 140, self.part_scales[0], self.part_y_offset[0])  # Base
-        if self.part_scales[1] > 0:
-            draw_scaled_ellipse(0, 120, 110, 110, self.part_scales[1], self.part_y_offset[1])  # Middle
-        if self.part_scales[2] > 0:
-            draw_scaled_ellipse(0, 60, 80, 80, self.part_scales[2], self.part_y_offset[2])    # Head
-
-        if self.part_scales[3] > 0:
-            draw_scaled_line(center_x - 40, 170, center_x - 90, 140, self.part_scales[3], self.part_y_offset[3])  # Left arm
-        if self.part_scales[4] > 0:
-            draw_scaled_line(center_x + 40, 170, center_x + 90, 140, self.part_scales[4], self.part_y_offset[4])  # Right arm
-        if self.part_scales[5] > 0:
-            # Face
-            painter.drawEllipse(
-                int(center_x - 15),
-                int(90 + self.part_y_offset[5]),
-                int(5 * self.part_scales[5]),
-                int(5 * self.part_scales[5])
-            )
-            painter.drawEllipse(
-                int(center_x + 10),
-                int(90 + self.part_y_offset[5]),
-                int(5 * self.part_scales[5]),
-                int(5 * self.part_scales[5])
-            )
-
-            painter.drawArc(int(center_x - 15), int(105 + self.part_y_offset[5]), 30, 15, 0, -180 * 16)
-        if self.part_scales[6] > 0:
-            painter.drawLine(int(center_x - 40), int(65 + self.part_y_offset[6]), int(center_x + 40), 65)  # Hat brim
-            painter.drawRect(int(center_x - 25), int(25 + self.part_y_offset[6]), 50, 40)  # Hat top
-        
     def reset(self):
+        if self.timer is not None:
+            self.timer.stop()
+        self.pending_melts.clear()
+        self.melts_scheduled = 0
         self.parts_remaining = self.max_parts
         self.animating = False
         self.current_melting = None
         self.part_scales = [1.0] * self.max_parts
-        self.update()
\ No newline at end of file
+        self.part_y_offset = [0] * self.max_parts
+        self.update()
+
+
+class MessageLog(QAbstractListModel):
+    # Fixed-capacity ring buffer of messages. Appends are queued and
+    # flushed to attached views once per event-loop pass.
+    def __init__(self, capacity=500, parent=None):
+        super().__init__(parent)
+        self.lines = deque(maxlen=capacity)
+        self.pending = deque(maxlen=capacity)
+        self.flush_scheduled = False
+
+    def append(self, text):
+        self.pending.append(text)
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            QTimer.singleShot(0, self.flush)
+
+    def clear(self):
+        self.pending.clear()
+        self.beginResetModel()
+        self.lines.clear()
+        self.endResetModel()
+
+    def flush(self):
+        self.flush_scheduled = False
+        if not self.pending:
+            return
+        lines = self.lines
+
+        overflow = len(lines) + len(self.pending) - lines.maxlen
+        if overflow > 0:
+            overflow = min(overflow, len(lines))
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                lines.popleft()
+            self.endRemoveRows()
+
+        self.beginInsertRows(QModelIndex(), len(lines), len(lines) + len(self.pending) - 1)
+        lines.extend(self.pending)
+        self.endInsertRows()
+        self.pending.clear()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.lines)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self.lines[index.row()]
+        return None
+
+
+class MessageView(QListView):
+    # Only the visible rows are laid out (uniform item sizes), so the cost
+    # of a message does not grow with the length of the session.
+    def __init__(self, capacity=500, parent=None):
+        super().__init__(parent)
+        self.log = MessageLog(capacity, self)
+        self.setModel(self.log)
+        self.setUniformItemSizes(True)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.log.rowsInserted.connect(self.scrollToBottom)
+
+    def append(self, text):
+        self.log.append(text)
+
+    def clear(self):
+        self.log.clear()
+
+
+class AlphabetTracker(QWidget):
+    # One cell per letter of the current alphabet, painted by one widget.
+    # Each guess changes one cell's state and only that cell's rect is
+    # repainted. Clicking an unused cell emits letterClicked.
+    UNUSED, CORRECT, WRONG = range(3)
+
+    letterClicked = pyqtSignal(str)
+
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    columns = 13
+    cell_size = 30
+    spacing = 4
+
+    colors = {
+        UNUSED: (QColor("#ffffff"), QColor("#00acc1"), QColor("#006064")),  # fill, border, text
+        CORRECT: (QColor("#66bb6a"), QColor("#43a047"), QColor("#ffffff")),
+        WRONG: (QColor("#ef5350"), QColor("#e53935"), QColor("#ffffff")),
+    }
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.cell_font = QFont("Segoe UI", 11, QFont.Bold)
+        self.set_letters(self.letters)
+        self.setCursor(Qt.PointingHandCursor)
+
+    def set_letters(self, letters):
+        # Switches to another alphabet; all cells start unused
+        if letters == self.letters and hasattr(self, "cells"):
+            self.reset()
+            return
+        self.letters = letters
+        self.states = [self.UNUSED] * len(letters)
+        step = self.cell_size + self.spacing
+        self.cells = [
+            QRect((i % self.columns) * step, (i // self.columns) * step, self.cell_size, self.cell_size)
+            for i in range(len(letters))
+        ]
+        self.setFixedSize(self.sizeHint())
+        self.update()
+
+    def sizeHint(self):
+        step = self.cell_size + self.spacing
+        rows = -(-len(self.letters) // self.columns)
+        return QSize(self.columns * step - self.spacing, rows * step - self.spacing)
+
+    def set_state(self, letter, state):
+        i = self.letters.find(letter)
+        if i < 0 or self.states[i] == state:
+            return
+        self.states[i] = state
+        self.update(self.cells[i])
+
+    def reset(self):
+        self.states = [self.UNUSED] * len(self.letters)
+        self.update()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.LeftButton:
+            return
+        for i, cell in enumerate(self.cells):
+            if cell.contains(event.pos()):
+                if self.states[i] == self.UNUSED:
+                    self.letterClicked.emit(self.letters[i])
+                return
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self.cell_font)
+        dirty = event.rect()
+        enabled = self.isEnabled()
+        for i, cell in enumerate(self.cells):
+            if not cell.intersects(dirty):
+                continue
+            fill, border, text = self.colors[self.states[i]]
+            if not enabled and self.states[i] == self.UNUSED:
+                fill = fill.darker(110)
+            painter.setPen(QPen(border, 2))
+            painter.setBrush(fill)
+            painter.drawRoundedRect(cell.adjusted(1, 1, -1, -1), 6, 6)
+            painter.setPen(text)
+            painter.drawText(cell, Qt.AlignCenter, self.letters[i].upper())
+
+
+class SpectatorGrid(QWidget):
+    # A grid of boards painted by one widget, for watching many games at
+    # once. Each cell blits its snowman from a sprite atlas holding one
+    # pre-rendered SnowmanDrawing per wrong-guess count, and draws the
+    # masked word from a cached QStaticText. A repaint blits all its cells'
+    # sprites with one drawPixmapFragments call. set_board() only marks the
+    # cell dirty; a single timer repaints the dirty cells at most once per
+    # frame_ms.
+    frame_ms = 16
+
+    background = QColor("#f4fbfc")
+    status_colors = {
+        PLAYING: QColor("#006064"),
+        WON: QColor("#43a047"),
+        LOST: QColor("#e53935"),
+    }
+
+    def __init__(self, count=0, cell_size=QSize(80, 100), parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)  # every cell paints its own background
+        self.cell_size = cell_size
+        self.cell_font = QFont("Segoe UI", 8, QFont.Bold)
+        self.metrics = QFontMetrics(self.cell_font)
+        self.columns = 1
+        self.boards = []  # (pattern, wrong, status) per cell
+        self.texts = []   # cell_text() per cell, None until painted
+        self.text_cache = {}
+        self.atlas = None
+        self.atlas_key = None  # (cell size, device pixel ratio) the atlas was built for
+        self.sprites = []      # source rect of each sprite in the atlas
+        self.dirty = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.frame_ms)
+        self.timer.timeout.connect(self.flush)
+        self.set_count(count)
+
+    def set_count(self, count):
+        del self.boards[count:]
+        del self.texts[count:]
+        while len(self.boards) < count:
+            self.boards.append(("", 0, PLAYING))
+            self.texts.append(None)
+        self.dirty.clear()
+        self.relayout()
+        self.update()
+
+    def set_board(self, index, pattern, wrong, status):
+        board = (pattern, min(wrong, SnowmanDrawing.max_parts), status)
+        if self.boards[index] == board:
+            return
+        if self.boards[index][0] != pattern:
+            self.texts[index] = None
+        self.boards[index] = board
+        self.dirty.add(index)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def flush(self):
+        if len(self.dirty) * 4 > len(self.boards):
+            self.update()
+        else:
+            for index in self.dirty:
+                self.update(self.cell_rect(index))
+        self.dirty.clear()
+
+    def cell_rect(self, index):
+        width, height = self.cell_size.width(), self.cell_size.height()
+        return QRect((index % self.columns) * width, (index // self.columns) * height, width, height)
+
+    def relayout(self):
+        self.columns = max(1, self.width() // self.cell_size.width())
+        rows = -(-len(self.boards) // self.columns)
+        self.setMinimumHeight(rows * self.cell_size.height())
+
+    def resizeEvent(self, event):
+        self.relayout()
+        super().resizeEvent(event)
+
+    def sizeHint(self):
+        columns = max(1, min(len(self.boards), 20))
+        rows = -(-len(self.boards) // columns)
+        return QSize(columns * self.cell_size.width(), rows * self.cell_size.height())
+
+    def sprite_rect(self):
+        # Where the snowman goes in a cell: the top of the cell, keeping the
+        # aspect ratio of the drawing's bounds, above one line of text
+        bounds = self.drawing_bounds()
+        width = self.cell_size.width()
+        height = self.cell_size.height() - self.metrics.height() - 6
+        scale = min(width / bounds.width(), height / bounds.height())
+        sprite = QSize(int(bounds.width() * scale), int(bounds.height() * scale))
+        return QRect((width - sprite.width()) // 2, 2, sprite.width(), sprite.height())
+
+    @staticmethod
+    def drawing_bounds():
+        # The part of the SnowmanDrawing canvas the resting parts cover
+        bounds = QRectF()
+        margin = SnowmanDrawing.pen_width / 2
+        for filled, outline, _, _ in SnowmanDrawing.parts():
+            bounds = bounds.united(filled.boundingRect().united(outline.boundingRect()))
+        return bounds.adjusted(-margin, -margin, margin, margin)
+
+    def build_atlas(self, dpr):
+        # One row of sprites, sprite k showing the snowman after k wrong
+        # guesses; drawn with the same geometry as SnowmanDrawing
+        sprite = self.sprite_rect()
+        bounds = self.drawing_bounds()
+        scale = sprite.width() / bounds.width()
+        source_width, source_height = round(sprite.width() * dpr), round(sprite.height() * dpr)
+        drawing = SnowmanDrawing()
+        atlas = QPixmap(source_width * (drawing.max_parts + 1), source_height)
+        atlas.fill(Qt.transparent)
+        painter = QPainter(atlas)
+        for wrong in range(drawing.max_parts + 1):
+            drawing.part_scales = [0.0 if part >= drawing.max_parts - wrong else 1.0
+                                   for part in range(drawing.max_parts)]
+            painter.resetTransform()
+            painter.translate(wrong * source_width, 0)
+            painter.scale(scale * dpr, scale * dpr)
+            painter.translate(-bounds.topLeft())
+            drawing.draw_snowman(painter)
+        painter.end()
+        drawing.deleteLater()
+
+        self.atlas = atlas
+        self.sprites = [QRectF(wrong * source_width, 0, source_width, source_height)
+                        for wrong in range(drawing.max_parts + 1)]
+        self.sprite_center = QPointF(sprite.center()) + QPointF(0.5, 0.5)
+        self.text_top = sprite.bottom() + 3
+        self.texts = [None] * len(self.boards)
+        self.text_cache = {}
+
+    def cell_text(self, index):
+        # (QStaticText, x offset in the cell) for the board's masked word;
+        # shared by boards showing the same pattern
+        pattern = self.boards[index][0]
+        entry = self.text_cache.get(pattern)
+        if entry is None:
+            if len(self.text_cache) >= 4 * len(self.boards) + 64:
+                self.text_cache.clear()
+            text = self.metrics.elidedText(" ".join(pattern).upper(), Qt.ElideRight, self.cell_size.width() - 4)
+            entry = self.text_cache[pattern] = (
+                QStaticText(text), (self.cell_size.width() - self.metrics.horizontalAdvance(text)) / 2)
+        self.texts[index] = entry
+        return entry
+
+    def paintEvent(self, event):
+        dpr = self.devicePixelRatioF()
+        if self.atlas_key != (self.cell_size, dpr):
+            self.build_atlas(dpr)
+            self.atlas_key = (self.cell_size, dpr)
+
+        painter = QPainter(self)
+        dirty = event.rect()
+        painter.fillRect(dirty, self.background)
+        painter.setFont(self.cell_font)
+
+        width, height = self.cell_size.width(), self.cell_size.height()
+        columns, boards, texts = self.columns, self.boards, self.texts
+        first_row, last_row = dirty.top() // height, dirty.bottom() // height
+        first_column, last_column = dirty.left() // width, min(dirty.right() // width, columns - 1)
+        cells = [
+            row * columns + column
+            for row in range(first_row, last_row + 1)
+            for column in range(first_column, last_column + 1)
+            if row * columns + column < len(boards)
+        ]
+
+        # Every sprite in one call, then the words grouped by colour
+        create, center, sprites = QPainter.PixmapFragment.create, self.sprite_center, self.sprites
+        painter.drawPixmapFragments(
+            [create(QPointF(index % columns * width, index // columns * height) + center,
+                    sprites[boards[index][1]], 1 / dpr, 1 / dpr)
+             for index in cells],
+            self.atlas)
+        for status, color in self.status_colors.items():
+            painter.setPen(color)
+            for index in cells:
+                if boards[index][2] != status:
+                    continue
+                text, offset = texts[index] or self.cell_text(index)
+                painter.drawStaticText(QPointF(index % columns * width + offset, index // columns * height
+                                               + self.text_top), text)
+
+
+class HintTask(QRunnable):
+    def __init__(self, runner, key):
+        super().__init__()
+        self.runner = runner
+        self.key = key
+
+    def run(self):
+        letter = self.runner.engine.hint(*self.key)
+        # Emitted from the pool thread; delivered queued to the GUI thread
+        self.runner.hintReady.emit(*self.key, letter or "")
+
+
+class HintRunner(QObject):
+    # Computes hints on the global thread pool and reports them through
+    # hintReady(category, pattern, guessed mask, letter), letter "" if none.
+    # Cached answers are reported straight away.
+    hintReady = pyqtSignal(str, str, object, str)  # masks can exceed a C++ int
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine  # game_hints.HintEngine
+        self.in_flight = set()
+        self.hintReady.connect(self.finished)
+
+    def request(self, category, pattern, guessed):
+        key = (category, pattern, guessed)
+        if key in self.in_flight:
+            return  # answered when the running task finishes
+        found, letter = self.engine.cached(*key)
+        if found:
+            self.hintReady.emit(*key, letter or "")
+        else:
+            self.in_flight.add(key)
+            QThreadPool.globalInstance().start(HintTask(self, key))
+
+    def finished(self, category, pattern, guessed, letter):
+        self.in_flight.discard((category, pattern, guessed))
@@ -0,0 +1,50 @@
+import threading
+from collections import OrderedDict
+
+
+class HintEngine:
+    # Best next letter for a game state, from the category's candidate words.
+    # Answers are kept in an LRU cache keyed by (category, pattern, guessed
+    # mask) since many players pass through the same states. Safe to call
+    # from worker threads: _lock only guards the cache, so cached() never
+    # waits on a computation, which runs under _solver_lock.
+    def __init__(self, word_bank, cache_size=4096):
+        self.word_bank = word_bank
+        self.solver = None  # built by the first hint, on the calling thread
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._solver_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def cached(self, category, pattern, guessed):
+        # Returns (True, letter) on a cache hit, (False, None) otherwise
+        key = (category, pattern, guessed)
+        with self._lock:
+            if key not in self._cache:
+                return False, None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return True, self._cache[key]
+
+    def hint(self, category, pattern, guessed):
+        found, letter = self.cached(category, pattern, guessed)
+        if found:
+            return letter
+
+        alphabet = self.word_bank.alphabet(category)
+        wrong = alphabet.mask_letters(guessed & ~alphabet.letters_mask(pattern))
+        with self._solver_lock:
+            # the solver builds its per-category tables lazily; one at a time
+            if self.solver is None:
+                from game_solver import Solver
+                from game_openings import load_book
+                self.solver = Solver(self.word_bank, book=load_book(self.word_bank))
+            letter = self.solver.best_letter(category, pattern, wrong)
+        with self._lock:
+            self.misses += 1
+            self._cache[(category, pattern, guessed)] = letter
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return letter
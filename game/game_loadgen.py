@@ -0,0 +1,127 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import deque
+
+from game_alphabet import LANGUAGES
+
+# Plays games against game_server.py from many concurrent sessions and
+# reports throughput and request latency.
+
+ALPHABET = LANGUAGES["en"]  # the server's default word files are English
+ORDER = "etaoinshrdlcumwfgypbvkjxqz"
+
+
+class Stats:
+    def __init__(self):
+        self.requests = 0
+        self.games = 0
+        self.wins = 0
+        self.errors = 0
+        self.latencies = []
+
+
+class Connection:
+    # Many sessions share one connection by pipelining requests; the server
+    # answers a connection's requests in order, so replies are matched FIFO.
+    def __init__(self, reader, writer, stats):
+        self.reader = reader
+        self.writer = writer
+        self.stats = stats
+        self.pending = deque()
+        self.reading = asyncio.ensure_future(self.read_replies())
+
+    async def read_replies(self):
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            future, start = self.pending.popleft()
+            self.stats.latencies.append(time.perf_counter() - start)
+            future.set_result(json.loads(line))
+        while self.pending:
+            self.pending.popleft()[0].set_exception(ConnectionError("server closed the connection"))
+
+    async def request(self, message):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((future, time.perf_counter()))
+        self.writer.write(json.dumps(message).encode() + b"\n")
+        reply = await future
+        self.stats.requests += 1
+        if not reply.get("ok"):
+            self.stats.errors += 1
+        return reply
+
+    def close(self):
+        self.reading.cancel()
+        self.writer.close()
+
+
+async def play(connection, stats, rng, deadline, random_order):
+    # Plays games back to back in one session slot until the deadline
+    while time.monotonic() < deadline:
+        state = await connection.request({"op": "new"})
+        if not state.get("ok"):
+            await asyncio.sleep(0.1)
+            continue
+        session = state["session"]
+        order = rng.sample(ALPHABET, len(ALPHABET)) if random_order else ORDER
+        for letter in order:
+            state = await connection.request({"op": "guess", "session": session, "letter": letter})
+            if state.get("status") != "playing":
+                break
+        stats.games += 1
+        stats.wins += state.get("status") == "won"
+        await connection.request({"op": "end", "session": session})
+
+
+async def run_connection(args, stats, deadline, seed):
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    connection = Connection(reader, writer, stats)
+    rng = random.Random(seed)
+    try:
+        await asyncio.gather(*(play(connection, stats, rng, deadline, args.random)
+                               for _ in range(args.sessions_per_connection)))
+    finally:
+        connection.close()
+
+
+async def run(args):
+    stats = Stats()
+    deadline = time.monotonic() + args.duration
+    start = time.perf_counter()
+    await asyncio.gather(*(run_connection(args, stats, deadline, i) for i in range(args.connections)))
+    return stats, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test game_server.py with many concurrent sessions.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH")
+    parser.add_argument("-c", "--connections", type=int, default=100)
+    parser.add_argument("-s", "--sessions-per-connection", type=int, default=100)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--random", action="store_true", help="guess in random order instead of by frequency")
+    args = parser.parse_args(argv)
+
+    stats, elapsed = asyncio.run(run(args))
+    latencies = sorted(stats.latencies) or [0.0]
+    sessions = args.connections * args.sessions_per_connection
+    print(f"{sessions} concurrent sessions over {args.connections} connections for {elapsed:.1f}s")
+    print(f"{stats.requests} requests ({stats.requests / elapsed:,.0f}/s), "
+          f"{stats.games} games ({stats.games / elapsed:,.0f}/s), "
+          f"win rate {stats.wins / max(stats.games, 1):.1%}, {stats.errors} errors")
+    print(f"latency ms: p50 {statistics.median(latencies) * 1e3:.2f}  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e3:.2f}  max {latencies[-1] * 1e3:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
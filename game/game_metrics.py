@@ -0,0 +1,199 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from functools import wraps
+
+# Latency histogram bucket bounds in seconds; 16 ms and 33 ms are the
+# 60 and 30 fps frame budgets.
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.016, 0.033, 0.1, 0.25, 1.0)
+
+# A melt timer tick this much later than its interval counts as late
+LATE_FACTOR = 1.5
+
+# Counter name -> label name (None for a plain counter)
+COUNTERS = {
+    "snowman_guesses_total": "outcome",
+    "snowman_games_total": "result",
+    "snowman_frames_dropped_total": None,
+    "snowman_frames_late_total": None,
+}
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class Metrics:
+    def __init__(self):
+        self.histograms = {}
+        self.counters = {name: {} for name in COUNTERS}
+
+    def observe(self, function, seconds):
+        histogram = self.histograms.get(function)
+        if histogram is None:
+            histogram = self.histograms[function] = Histogram()
+        histogram.observe(seconds)
+
+    def inc(self, name, label="", n=1):
+        values = self.counters[name]
+        values[label] = values.get(label, 0) + n
+
+    def reset(self):
+        self.histograms.clear()
+        for values in self.counters.values():
+            values.clear()
+
+    def snapshot(self):
+        return {
+            "call_seconds": {
+                function: {
+                    "buckets": dict(zip([str(b) for b in BUCKETS] + ["+Inf"], _cumulative(h.counts))),
+                    "sum": h.sum,
+                    "count": h.count,
+                }
+                for function, h in sorted(self.histograms.items())
+            },
+            "counters": {name: dict(values) for name, values in self.counters.items()},
+        }
+
+    def to_prometheus(self):
+        lines = [
+            "# HELP snowman_call_seconds Time spent in instrumented GUI calls.",
+            "# TYPE snowman_call_seconds histogram",
+        ]
+        for function, h in sorted(self.histograms.items()):
+            for bound, total in zip([repr(b) for b in BUCKETS] + ["+Inf"], _cumulative(h.counts)):
+                lines.append(f'snowman_call_seconds_bucket{{function="{function}",le="{bound}"}} {total}')
+            lines.append(f'snowman_call_seconds_sum{{function="{function}"}} {h.sum!r}')
+            lines.append(f'snowman_call_seconds_count{{function="{function}"}} {h.count}')
+        for name, label in COUNTERS.items():
+            lines.append(f"# TYPE {name} counter")
+            values = self.counters[name]
+            if label is None:
+                lines.append(f"{name} {values.get('', 0)}")
+            else:
+                for value, n in sorted(values.items()):
+                    lines.append(f'{name}{{{label}="{value}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        # JSON for *.json paths, Prometheus text format otherwise; the file
+        # is replaced atomically so collectors never read a partial one
+        text = json.dumps(self.snapshot(), indent=2) if path.endswith(".json") else self.to_prometheus()
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+
+def _cumulative(counts):
+    total = 0
+    out = []
+    for n in counts:
+        total += n
+        out.append(total)
+    return out
+
+
+METRICS = Metrics()
+
+# (class, method name) -> original function, for the methods patched by install()
+_originals = {}
+
+
+def _timed(func, metrics, name):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            metrics.observe(name, time.perf_counter() - start)
+    return wrapper
+
+
+def _counted_guess(func, metrics):
+    # Outcome and result counters from the engine state around the guess
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        engine = self.engine
+        guessed, wrong, status = engine.guessed, engine.wrong_guesses, engine.status
+        result = func(self, *args, **kwargs)
+        engine = self.engine
+        if engine.guessed == guessed:
+            metrics.inc("snowman_guesses_total", "ignored")
+        else:
+            metrics.inc("snowman_guesses_total", "wrong" if engine.wrong_guesses > wrong else "correct")
+        if engine.status != status:
+            metrics.inc("snowman_games_total", engine.status)
+        return result
+    return wrapper
+
+
+def _melt_position(drawing):
+    # Steps of the whole melt sequence played so far
+    done = drawing.max_parts - drawing.parts_remaining
+    return done * drawing.melt_steps + (drawing.melt_step if drawing.animating else 0)
+
+
+def _frame_checked(func, metrics):
+    # A tick that advances the melt by more than one step dropped frames;
+    # one that fires well after its interval is late.
+    last_tick = {}
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        now = time.perf_counter()
+        previous = last_tick.get(id(self))
+        if previous is not None and now - previous > LATE_FACTOR * self.melt_step_ms / 1000:
+            metrics.inc("snowman_frames_late_total")
+        before = _melt_position(self)
+        result = func(self, *args, **kwargs)
+        skipped = _melt_position(self) - before - 1
+        if skipped > 0:
+            metrics.inc("snowman_frames_dropped_total", n=skipped)
+        if self.animating:
+            last_tick[id(self)] = now
+        else:
+            last_tick.pop(id(self), None)
+        return result
+    return wrapper
+
+
+def install(game_class, drawing_class, metrics=METRICS):
+    # Wraps the GUI hot paths of SnowmanGame and SnowmanDrawing. Until this
+    # is called they run untouched, so disabled metrics cost nothing.
+    # Install before creating the window: signal connections made earlier
+    # keep calling the unwrapped methods.
+    if _originals:
+        return
+    targets = [
+        (game_class, "handle_guess", None),
+        (game_class, "guess_letter", _counted_guess),
+        (game_class, "update_word_display", None),
+        (game_class, "check_game_status", None),
+        (drawing_class, "paintEvent", None),
+        (drawing_class, "animate_melt", _frame_checked),
+    ]
+    for cls, name, extra in targets:
+        func = cls.__dict__[name]
+        _originals[cls, name] = func
+        wrapped = _timed(func, metrics, name)
+        setattr(cls, name, extra(wrapped, metrics) if extra else wrapped)
+
+
+def uninstall():
+    for (cls, name), func in _originals.items():
+        setattr(cls, name, func)
+    _originals.clear()
@@ -0,0 +1,175 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+from game_engine import index_word
+from game_solver import Solver, pick_letter
+from game_words import WORDS_DIR, load_word_bank
+
+BOOK_PATH = os.path.join(os.path.expanduser("~"), ".snowman_openings.bin")
+
+# Opening book layout (little endian):
+#   header: magic, word bank fingerprint (40 ascii hex digits),
+#           moves covered (u32), table slots (u32, a power of two)
+#   slots:  state hash (u64), candidate words (u32),
+#           chance the letter is in the word (u16, /65535),
+#           move number from 0 (u8), best letter (u16 code point, 0 = empty slot)
+# States are found by open addressing with linear probing on the hash of
+# (category, pattern, guessed mask).
+MAGIC = b"SNOWOPN2"
+_HEADER = struct.Struct("<8s40sII")
+_SLOT = struct.Struct("<QIHBH")
+_SLOT_LETTER = struct.Struct("<H")
+
+
+def state_hash(category, pattern, guessed):
+    key = f"{category}\0{pattern}\0{guessed}".encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+def walk(solver, category, pattern, wrong, move, moves, out):
+    # Records the solver's choice for this state, then follows every
+    # answer the game could give to it.
+    group, idx = solver.filter(category, pattern, wrong)
+    if len(idx) <= 1:
+        return
+    entropy, counts = solver.letter_scores(category, pattern, wrong)
+    alphabet = solver.word_bank.alphabet(category)
+    guessed = alphabet.letters_mask(pattern) | alphabet.letters_mask(wrong)
+    letter = pick_letter(entropy, counts, guessed, alphabet.letters)
+    if letter is None:
+        return
+    code = alphabet.letters.index(letter)
+    out.append((state_hash(category, pattern, guessed), len(idx),
+                round(counts[code] / len(idx) * 65535), move, ord(letter)))
+    if move + 1 >= moves:
+        return
+
+    for hits in np.unique(group.codes[idx] == code, axis=0):
+        if hits.any():
+            revealed = ''.join(letter if hit else ch for ch, hit in zip(pattern, hits))
+            walk(solver, category, revealed, wrong, move + 1, moves, out)
+        else:
+            walk(solver, category, pattern, wrong + (letter,), move + 1, moves, out)
+
+
+# Per-process state, set up once by the pool initializer
+_worker = {}
+
+
+def _init_worker(words):
+    word_bank = load_word_bank(words)
+    _worker["bank"] = word_bank
+    _worker["solver"] = Solver(word_bank)
+
+
+def build_category(args):
+    category, moves = args
+    out = []
+    alphabet = _worker["bank"].alphabet(category)
+    # Non-letters (spaces, hyphens) are shown from the start, so every
+    # layout of them opens its own tree
+    starts = sorted({index_word(word, alphabet).start for word in _worker["bank"][category]})
+    for start in starts:
+        walk(_worker["solver"], category, start, (), 0, moves, out)
+    return category, out
+
+
+def build(words=WORDS_DIR, path=BOOK_PATH, moves=3, workers=None):
+    word_bank = load_word_bank(words)
+    tasks = [(name, moves) for name in word_bank.keys()]
+    entries = []
+    if workers == 1:
+        _init_worker(words)
+        for task in tasks:
+            entries.extend(build_category(task)[1])
+    else:
+        with Pool(workers, initializer=_init_worker, initargs=(words,)) as pool:
+            for _, out in pool.imap_unordered(build_category, tasks):
+                entries.extend(out)
+
+    size = 1
+    while size < 2 * len(entries):
+        size *= 2
+    table = bytearray(_SLOT.size * size)
+    mask = size - 1
+    for entry in entries:
+        i = entry[0] & mask
+        while _SLOT_LETTER.unpack_from(table, i * _SLOT.size + 15)[0]:  # letter set: slot taken
+            i = (i + 1) & mask
+        _SLOT.pack_into(table, i * _SLOT.size, *entry)
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, word_bank.fingerprint().encode("ascii"), moves, size))
+        f.write(table)
+    return len(entries), _HEADER.size + len(table)
+
+
+class OpeningBook:
+    def __init__(self, buffer):
+        magic, fingerprint, self.moves, self.size = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("not an opening book file")
+        self.fingerprint = fingerprint.decode("ascii")
+        self._buffer = buffer
+        self._mask = self.size - 1
+
+    @classmethod
+    def load(cls, path=BOOK_PATH):
+        with open(path, "rb") as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def entry(self, category, pattern, guessed):
+        # (letter, candidate words, chance the letter is in the word), or None
+        h = state_hash(category, pattern, guessed)
+        i = h & self._mask
+        while True:
+            slot_hash, candidates, hit, _, letter = _SLOT.unpack_from(self._buffer, _HEADER.size + i * _SLOT.size)
+            if not letter:
+                return None
+            if slot_hash == h:
+                return chr(letter), candidates, hit / 65535
+            i = (i + 1) & self._mask
+
+    def lookup(self, category, pattern, guessed):
+        # Returns (True, letter) for a state in the book, (False, None) otherwise
+        entry = self.entry(category, pattern, guessed)
+        if entry is None:
+            return False, None
+        return True, entry[0]
+
+
+def load_book(word_bank, path=BOOK_PATH):
+    # The opening book for this word bank, or None if there is no book or it
+    # was built from different words
+    try:
+        book = OpeningBook.load(path)
+    except (OSError, ValueError):
+        return None
+    if book.fingerprint != word_bank.fingerprint():
+        return None
+    return book
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the opening book of best first guesses.")
+    parser.add_argument("--words", default=WORDS_DIR, help="words directory or compiled word bank")
+    parser.add_argument("-o", "--output", default=BOOK_PATH)
+    parser.add_argument("-m", "--moves", type=int, default=3, help="moves per game to cover")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    states, size = build(args.words, args.output, args.moves, args.workers)
+    print(f"{states} states, {size} bytes, {time.perf_counter() - start:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import namedtuple
+
+from game_engine import GameEngine, PLAYING, WON, LOST
+from game_words import WORDS_DIR, load_word_bank
+
+# Game log layout (little endian):
+#   header: magic, offset of the last index block (u64, 0 = none yet)
+#   then records, each starting with a tag byte:
+#     GAME:  seed (u64, 0 if the word was not picked from one; replays
+#            always start from the recorded word), flags (u8, EVIL),
+#            max wrong (u8), final status (u8, see STATUS_CODES),
+#            wrong guesses (u8), guess count (u16),
+#            category and word (u16 length + utf-8 each),
+#            then per guess: u8 length + the utf-8 text given to the game
+#     INDEX: first game number (u32), game count (u32), previous index
+#            block (u64), then the offset of each of those games (u64)
+# An index block follows every `index_every` games; the header pointer is
+# only moved once the block is on disk.
+MAGIC = b"SNOWREC1"
+_HEADER = struct.Struct("<8sQ")
+GAME, INDEX = 1, 2
+_GAME = struct.Struct("<BQBBBBH")
+_INDEX = struct.Struct("<BIIQ")
+_LEN16 = struct.Struct("<H")
+EVIL = 1
+STATUS_CODES = {PLAYING: 0, WON: 1, LOST: 2}
+STATUS_NAMES = {code: status for status, code in STATUS_CODES.items()}
+
+GameRecord = namedtuple("GameRecord", ["seed", "category", "word", "guesses", "max_wrong", "evil", "status", "wrong"])
+
+
+class Recorder:
+    def __init__(self, path, index_every=256):
+        self.index_every = index_every
+        if os.path.exists(path) and os.path.getsize(path) >= _HEADER.size:
+            self.file = open(path, "r+b")
+            magic, self.last_index = _HEADER.unpack(self.file.read(_HEADER.size))
+            if magic != MAGIC:
+                self.file.close()
+                raise ValueError(f"{path} is not a game log")
+            # Games written after the last index block still need indexing,
+            # and new games go after the last complete record, replacing
+            # any record a crash cut short
+            log = GameLog(path)
+            self.games = len(log)
+            self.unindexed = log.unindexed
+            end = log.end
+            log.close()
+            self.file.truncate(end)
+        else:
+            self.file = open(path, "w+b")
+            self.file.write(_HEADER.pack(MAGIC, 0))
+            self.last_index = 0
+            self.games = 0
+            self.unindexed = []
+        self.file.seek(0, os.SEEK_END)
+
+    def record(self, seed, category, word, guesses, max_wrong=7, evil=False, status=PLAYING, wrong=0):
+        parts = [_GAME.pack(GAME, seed, EVIL if evil else 0, max_wrong, STATUS_CODES[status], wrong, len(guesses))]
+        for text in (category, word):
+            data = text.encode("utf-8")
+            parts.append(_LEN16.pack(len(data)) + data)
+        for guess in guesses:
+            data = guess.encode("utf-8")[:255]
+            parts.append(bytes((len(data),)) + data)
+        self.unindexed.append(self.file.tell())
+        self.file.write(b"".join(parts))
+        self.games += 1
+        if len(self.unindexed) >= self.index_every:
+            self.write_index()
+
+    def write_index(self):
+        if not self.unindexed:
+            return
+        offset = self.file.tell()
+        first = self.games - len(self.unindexed)
+        self.file.write(_INDEX.pack(INDEX, first, len(self.unindexed), self.last_index))
+        self.file.write(array("Q", self.unindexed).tobytes() if sys.byteorder == "little"
+                        else struct.pack(f"<{len(self.unindexed)}Q", *self.unindexed))
+        self.file.flush()
+        self.file.seek(0)
+        self.file.write(_HEADER.pack(MAGIC, offset))
+        self.file.seek(0, os.SEEK_END)
+        self.last_index = offset
+        self.unindexed = []
+
+    def close(self):
+        self.write_index()
+        self.file.close()
+
+
+class GameLog:
+    # Read-only view of a game log: len(), log[i] and iteration. Index
+    # blocks are followed back from the header, so opening costs one read
+    # per block, and only games after the last block are scanned.
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, last_index = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a game log")
+
+        blocks = []
+        end = _HEADER.size
+        offset = last_index
+        while offset:
+            _, first, count, previous = _INDEX.unpack_from(self._buffer, offset)
+            blocks.append((offset + _INDEX.size, count))
+            if offset == last_index:
+                end = offset + _INDEX.size + 8 * count
+            offset = previous
+        self._offsets = array("Q")
+        for pos, count in reversed(blocks):
+            self._offsets.extend(struct.unpack_from(f"<{count}Q", self._buffer, pos))
+
+        # Games recorded after the last index block (e.g. after a crash);
+        # `end` is where the last complete record ends
+        self.unindexed = []
+        pos = end
+        try:
+            while pos < len(self._buffer):
+                tag = self._buffer[pos]
+                if tag == GAME:
+                    next_pos = self._read(pos)[1]
+                    if next_pos > len(self._buffer):
+                        break
+                    self.unindexed.append(pos)
+                    pos = next_pos
+                elif tag == INDEX:
+                    _, _, count, _ = _INDEX.unpack_from(self._buffer, pos)
+                    if pos + _INDEX.size + 8 * count > len(self._buffer):
+                        break
+                    pos += _INDEX.size + 8 * count
+                else:
+                    break
+        except (struct.error, IndexError, KeyError, UnicodeDecodeError):
+            pass  # a record cut short by a crash ends the log
+        self.end = pos
+        self._offsets.extend(self.unindexed)
+
+    def _read(self, pos):
+        buffer = self._buffer
+        _, seed, flags, max_wrong, status, wrong, count = _GAME.unpack_from(buffer, pos)
+        pos += _GAME.size
+        texts = []
+        for _ in range(2):
+            (size,) = _LEN16.unpack_from(buffer, pos)
+            pos += _LEN16.size
+            texts.append(buffer[pos:pos + size].decode("utf-8"))
+            pos += size
+        guesses = []
+        for _ in range(count):
+            size = buffer[pos]
+            guesses.append(buffer[pos + 1:pos + 1 + size].decode("utf-8", "replace"))
+            pos += 1 + size
+        record = GameRecord(seed, texts[0], texts[1], guesses, max_wrong, bool(flags & EVIL),
+                            STATUS_NAMES[status], wrong)
+        return record, pos
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def __getitem__(self, index):
+        return self._read(self._offsets[index])[0]
+
+    def __iter__(self):
+        for offset in self._offsets:
+            yield self._read(offset)[0]
+
+    def close(self):
+        self._buffer.close()
+
+
+class VirtualClock:
+    # Stands in for SnowmanDrawing.clock so melts advance on demand
+    def __init__(self):
+        self.now = 0
+
+    def elapsed(self):
+        return self.now
+
+
+class Replayer:
+    # Runs recorded games through the game rules. With draw=True each wrong
+    # guess also plays the melt animation on an offscreen SnowmanDrawing,
+    # frame by frame on a virtual clock, rendering every frame.
+    def __init__(self, word_bank, draw=False):
+        self.engines = {False: GameEngine(word_bank)}
+        self.word_bank = word_bank
+        self.drawing = None
+        self.frames = 0
+        if draw:
+            os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+            from PyQt5.QtWidgets import QApplication
+            from PyQt5.QtGui import QImage
+            from game_frontend import SnowmanDrawing
+            self.app = QApplication.instance() or QApplication([])
+            self.drawing = SnowmanDrawing()
+            self.drawing.resize(SnowmanDrawing.drawing_width, SnowmanDrawing.drawing_height)
+            self.drawing.clock = VirtualClock()
+            self.image = QImage(self.drawing.size(), QImage.Format_ARGB32_Premultiplied)
+
+    def engine(self, record):
+        engine = self.engines.get(record.evil)
+        if engine is None:
+            from game_evil import EvilEngine
+            engine = self.engines[record.evil] = EvilEngine(self.word_bank)
+        engine.max_wrong = record.max_wrong
+        return engine
+
+    def play(self, record, on_guess=None):
+        engine = self.engine(record)
+        engine.start(record.category, record.word)
+        drawing = self.drawing
+        if drawing is not None:
+            drawing.reset()
+            drawing.clock.now = 0
+        for text in record.guesses:
+            result = engine.guess(text)
+            if on_guess is not None:
+                on_guess(engine, result)
+            if drawing is not None:
+                drawing.set_wrong_guesses(engine.wrong_guesses)
+                self.render_melts()
+        return engine
+
+    def render_melts(self):
+        drawing = self.drawing
+        while drawing.animating:
+            drawing.clock.now += drawing.melt_step_ms
+            drawing.animate_melt()
+            drawing.render(self.image)
+            self.frames += 1
+        if drawing.timer is not None:
+            drawing.timer.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded games at full speed.")
+    parser.add_argument("log", help="game log written with 'game_logic.py --record PATH'")
+    parser.add_argument("--words", default=WORDS_DIR, help="words directory or compiled word bank")
+    parser.add_argument("--seek", type=int, metavar="N", help="replay only game N, guess by guess")
+    parser.add_argument("--draw", action="store_true", help="also render the melt animation offscreen")
+    args = parser.parse_args(argv)
+
+    log = GameLog(args.log)
+    replayer = Replayer(load_word_bank(args.words), draw=args.draw)
+
+    if args.seek is not None:
+        record = log[args.seek]
+        print(f"game {args.seek}: seed {record.seed}, {record.category}, '{record.word}'"
+              f"{' (evil)' if record.evil else ''}")
+        engine = replayer.play(record, lambda e, r: print(f"  {r.letter!r:6} {r.outcome:<9} {e.pattern}"))
+        print(f"  -> {engine.status}, {engine.wrong_guesses} wrong (recorded: {record.status}, {record.wrong})")
+        return 0
+
+    start = time.perf_counter()
+    mismatches = wins = 0
+    for i, record in enumerate(log):
+        engine = replayer.play(record)
+        wins += engine.status == WON
+        if (engine.status, engine.wrong_guesses) != (record.status, record.wrong):
+            mismatches += 1
+            print(f"game {i}: replayed {engine.status}/{engine.wrong_guesses}, "
+                  f"recorded {record.status}/{record.wrong}", file=sys.stderr)
+    elapsed = time.perf_counter() - start
+    games = len(log)
+    print(f"{games} games in {elapsed:.2f}s ({games / max(elapsed, 1e-9):,.0f} games/s), "
+          f"{wins} won, {mismatches} differ from the recording"
+          + (f", {replayer.frames} frames rendered" if args.draw else ""))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+import json
+import os
+import random
+
+from game_words import WordBank
+
+STATE_PATH = os.path.join(os.path.expanduser("~"), ".snowman_decks.json")
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix(x):
+    # splitmix64 finalizer
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EB & _MASK64
+    return x ^ (x >> 31)
+
+
+class Permutation:
+    # Keyed bijection on range(n): a 4-round Feistel network over the next
+    # even power of two, cycle-walking until the value falls inside n.
+    # O(1) time and memory per lookup, whatever the size of n.
+    rounds = 4
+
+    def __init__(self, n, key):
+        if n <= 0:
+            raise ValueError("cannot permute an empty range")
+        self.n = n
+        half = max(1, ((n - 1).bit_length() + 1) // 2)
+        self.half = half
+        self.half_mask = (1 << half) - 1
+        self.keys = [_mix(key + i) for i in range(self.rounds)]
+
+    def __getitem__(self, index):
+        x = index
+        while True:
+            left, right = x >> self.half, x & self.half_mask
+            for k in self.keys:
+                left, right = right, left ^ (_mix(right ^ k) & self.half_mask)
+            x = left << self.half | right
+            if x < self.n:
+                return x
+
+
+class Deck:
+    # Deals every index of range(n) once in shuffled order, then reshuffles.
+    # The state is just (key, position).
+    def __init__(self, n, key, position=0):
+        self.n = n
+        self.key = key
+        self.position = position
+        self.order = Permutation(n, key)
+
+    def draw(self):
+        if self.position >= self.n:
+            self.key = _mix(self.key)
+            self.order = Permutation(self.n, self.key)
+            self.position = 0
+        index = self.order[self.position]
+        self.position += 1
+        return index
+
+
+class AliasTable:
+    # Walker/Vose alias method: O(n) setup, O(1) weighted sampling
+    def __init__(self, weights):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("weights must contain a positive value")
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = [0] * n
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+
+    def sample(self, rng):
+        i = rng.randrange(len(self.prob))
+        return i if rng.random() < self.prob[i] else self.alias[i]
+
+
+class WordScheduler:
+    # Picks (category, word index) for new games.
+    #   category_weights: None (uniform), "size" (proportional to the number
+    #                     of words) or {category: weight}
+    #   word_weights:     {category: [weight per word]}; such categories are
+    #                     sampled by weight (repeats allowed) instead of dealt
+    #                     from a no-repeat deck
+    #   state_path:       where deck positions are kept between runs
+    def __init__(self, word_bank, category_weights=None, word_weights=None, state_path=None, rng=None):
+        if not isinstance(word_bank, WordBank):
+            word_bank = WordBank.from_dict(word_bank)
+        self.word_bank = word_bank
+        self.names = word_bank.playable()
+        if not self.names:
+            raise ValueError("word bank has no words")
+        self.rng = random.Random() if rng is None else rng
+        self.state_path = state_path
+
+        if category_weights is None:
+            self.categories = None
+        else:
+            if category_weights == "size":
+                category_weights = {name: len(word_bank[name]) for name in self.names}
+            self.categories = AliasTable([category_weights.get(name, 0) for name in self.names])
+
+        self.word_tables = {name: AliasTable(w) for name, w in (word_weights or {}).items()}
+        self.decks = {}
+        if state_path:
+            self.load()
+
+    def deck(self, category):
+        deck = self.decks.get(category)
+        if deck is None:
+            deck = self.decks[category] = Deck(len(self.word_bank[category]), self.rng.getrandbits(64))
+        return deck
+
+    def next_index(self):
+        if self.categories is None:
+            category = self.names[self.rng.randrange(len(self.names))]
+        else:
+            category = self.names[self.categories.sample(self.rng)]
+        table = self.word_tables.get(category)
+        index = table.sample(self.rng) if table else self.deck(category).draw()
+        return category, index
+
+    def next_word(self):
+        category, index = self.next_index()
+        return category, self.word_bank[category][index]
+
+    def load(self):
+        try:
+            with open(self.state_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(state, dict):
+            return
+        for category, entry in state.items():
+            # Entries that are not [size, key, position] are ignored, and a
+            # category that changed size starts a fresh deck
+            if not (isinstance(entry, list) and len(entry) == 3 and all(type(v) is int for v in entry)):
+                continue
+            size, key, position = entry
+            if category in self.names and len(self.word_bank[category]) == size and 0 <= position <= size:
+                self.decks[category] = Deck(size, key, position)
+
+    def save(self):
+        if not self.state_path:
+            return
+        state = {name: (deck.n, deck.key, deck.position) for name, deck in self.decks.items()}
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.state_path)
@@ -0,0 +1,215 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import traceback
+
+from game_engine import PLAYING, CORRECT, WRONG
+from game_state import SessionStore, StaleSession
+from game_words import WORDS_DIR, load_word_bank
+
+# Protocol: one JSON object per line in each direction.
+#   {"op": "new", "seed": 1, "player": "ann"}       -> new session
+#   {"op": "guess", "session": 3, "letter": "e"}    -> guess in a session
+#   {"op": "state", "session": 3}                   -> current state
+#   {"op": "end", "session": 3}                     -> drop a session
+# "session" defaults to the last session created on the connection. A
+# connection can only use the sessions it created, and they are dropped when
+# it closes.
+# Replies carry "ok": true, or "ok": false with an "error" message.
+
+MAX_LINE = 1024
+HIGH_WATER = 64 * 1024
+
+
+class ProtocolError(Exception):
+    pass
+
+
+class GameServer:
+    def __init__(self, word_bank, max_sessions=100000, idle_timeout=300.0, max_wrong=7, stats=None):
+        self.word_bank = word_bank
+        self.stats = stats  # game_stats.StatsStore; finished games are recorded there
+        self.player_ids = {"": 0}  # player names are interned; sessions keep the number
+        self.player_names = [""]
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.rng = random.Random()
+        self.sessions = SessionStore(word_bank, max_wrong)
+        self.connections = 0
+        self.evicted = 0
+
+    def state(self, session_id):
+        try:
+            state = self.sessions.state(session_id)
+        except StaleSession:
+            raise ProtocolError(f"unknown session {session_id}") from None
+        reply = {
+            "ok": True,
+            "session": session_id,
+            "category": state["category"],
+            "pattern": state["pattern"],
+            "wrong": state["wrong"],
+            "max_wrong": self.sessions.max_wrong,
+            "status": state["status"],
+        }
+        if state["status"] != PLAYING:
+            reply["word"] = state["word"]
+        return reply
+
+    def new_session(self, seed=None, player=""):
+        if len(self.sessions) >= self.max_sessions:
+            raise ProtocolError("server busy")
+        if not isinstance(player, str) or len(player) > 64:
+            raise ProtocolError("player must be a string of at most 64 characters")
+        if seed is not None and not isinstance(seed, (int, str)):
+            raise ProtocolError("seed must be an integer or a string")
+        player_id = self.player_ids.get(player)
+        if player_id is None:
+            player_id = self.player_ids[player] = len(self.player_names)
+            self.player_names.append(player)
+        rng = self.rng if seed is None else random.Random(seed)
+        return self.sessions.create(self.word_bank.word_id(*self.word_bank.random_index(rng)), player_id)
+
+    def handle(self, request, current, owned=None):
+        # owned: the session ids the connection created, or None to allow any
+        op = request.get("op")
+        if op == "new":
+            session_id = self.new_session(request.get("seed"), request.get("player", ""))
+            if owned is not None:
+                owned.add(session_id)
+            return self.state(session_id), session_id
+
+        session_id = request.get("session", current)
+        if session_id is None:
+            raise ProtocolError("no session, send a 'new' request first")
+        if not isinstance(session_id, int):
+            raise ProtocolError("session must be an integer")
+        if owned is not None and session_id not in owned:
+            raise ProtocolError(f"unknown session {session_id}")
+        try:
+            if op == "guess":
+                letter = request.get("letter")
+                if not isinstance(letter, str):
+                    raise ProtocolError("letter must be a string")
+                outcome = self.sessions.guess(session_id, letter)
+                reply = self.state(session_id)
+                reply["outcome"] = outcome
+                if self.stats is not None and outcome in (CORRECT, WRONG) and reply["status"] != PLAYING:
+                    self.record(session_id)
+                return reply, session_id
+            if op == "state":
+                return self.state(session_id), session_id
+            if op == "end":
+                if owned is not None:
+                    owned.discard(session_id)
+                self.sessions.release(session_id)
+                return {"ok": True, "session": session_id}, None
+        except StaleSession:
+            if owned is not None:
+                owned.discard(session_id)  # evicted while idle
+            raise ProtocolError(f"unknown session {session_id}") from None
+        raise ProtocolError(f"unknown op {op!r}")
+
+    def record(self, session_id):
+        from game_stats import StatsUnavailable
+        state = self.sessions.state(session_id)
+        try:
+            self.stats.record(self.player_names[state["player"]], state["category"], state["status"],
+                              state["wrong"], state["seconds"])
+        except StatsUnavailable as e:
+            print(f"stats: {e}; not recording games", file=sys.stderr)
+            self.stats = None
+
+    async def serve_client(self, reader, writer):
+        self.connections += 1
+        current = None
+        owned = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ProtocolError("request must be a JSON object")
+                    reply, current = self.handle(request, current, owned)
+                except (ValueError, ProtocolError) as e:
+                    reply = {"ok": False, "error": str(e)}
+                except Exception:
+                    # A bug in one request must not drop the connection
+                    traceback.print_exc()
+                    reply = {"ok": False, "error": "internal error"}
+                writer.write(json.dumps(reply).encode() + b"\n")
+
+                # Stop reading from a client that is not reading its replies
+                if writer.transport.get_write_buffer_size() > HIGH_WATER:
+                    await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            for session_id in owned:
+                try:
+                    self.sessions.release(session_id)
+                except StaleSession:
+                    pass  # already evicted
+            writer.close()
+
+    async def evict_idle(self):
+        while True:
+            await asyncio.sleep(max(self.idle_timeout / 4, 1.0))
+            self.evicted += self.sessions.evict_idle(self.idle_timeout)
+
+    async def serve(self, host=None, port=None, unix=None):
+        if unix:
+            server = await asyncio.start_unix_server(self.serve_client, unix, limit=MAX_LINE)
+        else:
+            server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE, backlog=4096)
+        evictor = asyncio.ensure_future(self.evict_idle())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            evictor.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Host many Snowman games over a JSON-lines socket protocol.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--words", default=WORDS_DIR, help="words directory or compiled word bank")
+    parser.add_argument("--max-sessions", type=int, default=100000)
+    parser.add_argument("--idle-timeout", type=float, default=300.0, help="seconds before an idle session is dropped")
+    parser.add_argument("--stats", metavar="DB", help="record finished games in this SQLite stats database")
+    args = parser.parse_args(argv)
+
+    stats = None
+    if args.stats:
+        from game_stats import StatsStore, StatsUnavailable
+        stats = StatsStore(args.stats)
+        try:
+            stats.flush()  # fail now rather than at the first finished game
+        except StatsUnavailable as e:
+            print(e, file=sys.stderr)
+            stats.close()
+            return 1
+    server = GameServer(load_word_bank(args.words), args.max_sessions, args.idle_timeout, stats=stats)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if stats is not None:
+            stats.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+import argparse
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+from game_engine import GameEngine, PLAYING, WON, INVALID, REPEAT
+from game_words import WORDS_DIR, load_word_bank
+
+
+def open_letters(engine):
+    bits = engine.alphabet.bits
+    return [letter for letter in engine.alphabet.letters if not engine.guessed & bits[letter]]
+
+
+def random_strategy(word_bank):
+    def guess(engine, rng):
+        # Rejection sampling: at most 7 wrong + word letters are ever taken
+        while True:
+            letters = engine.alphabet.letters
+            letter = letters[rng.randrange(len(letters))]
+            if not engine.guessed & engine.alphabet.bits[letter]:
+                return letter
+    return guess
+
+
+def frequency_strategy(word_bank):
+    # Guess letters in order of how many words of the category contain them
+    orders = {}
+
+    def guess(engine, rng):
+        alphabet = engine.alphabet
+        order = orders.get(engine.category)
+        if order is None:
+            counts = dict.fromkeys(alphabet.letters, 0)
+            for word in word_bank[engine.category]:
+                for letter in set(alphabet.fold(word)):
+                    if letter in counts:
+                        counts[letter] += 1
+            order = orders[engine.category] = sorted(alphabet.letters, key=counts.get, reverse=True)
+        for letter in order:
+            if not engine.guessed & alphabet.bits[letter]:
+                return letter
+    return guess
+
+
+def solver_strategy(word_bank):
+    from game_solver import Solver
+    from game_openings import load_book
+    solver = Solver(word_bank, book=load_book(word_bank))
+
+    def guess(engine, rng):
+        letter = solver.best_letter(engine.category, engine.pattern, engine.wrong_letters)
+        return letter or rng.choice(open_letters(engine))
+    return guess
+
+
+STRATEGIES = {
+    "random": random_strategy,
+    "frequency": frequency_strategy,
+    "solver": solver_strategy,
+}
+
+
+def load_strategy(name, word_bank):
+    # Built-in strategy name, or "module:function" for a user-supplied
+    # callable(engine, rng) -> letter.
+    if name in STRATEGIES:
+        return STRATEGIES[name](word_bank)
+    module, _, func = name.partition(":")
+    if not func:
+        raise ValueError(f"Unknown strategy '{name}'")
+    return getattr(importlib.import_module(module), func)
+
+
+def play(engine, strategy, rng):
+    while engine.status == PLAYING:
+        result = engine.guess(strategy(engine, rng))
+        if result.outcome in (INVALID, REPEAT):
+            raise ValueError(f"Strategy made an illegal guess: {result.letter!r}")
+    return engine.status == WON
+
+
+# Per-process state, set up once by the pool initializer
+_worker = {}
+
+
+def _init_worker(words, strategy, max_wrong):
+    word_bank = load_word_bank(words)
+    _worker["engine"] = GameEngine(word_bank, max_wrong)
+    _worker["strategy"] = load_strategy(strategy, word_bank)
+
+
+def run_chunk(args):
+    seed, chunk, games = args
+    engine = _worker["engine"]
+    strategy = _worker["strategy"]
+    rng = random.Random(f"{seed}:{chunk}")
+    engine.rng.seed(f"{seed}:{chunk}:words")
+
+    stats = {}
+    for _ in range(games):
+        engine.new_game()
+        won = play(engine, strategy, rng)
+        row = stats.get(engine.category)
+        if row is None:
+            row = stats[engine.category] = [0, 0, 0]
+        row[0] += 1
+        row[1] += won
+        row[2] += engine.wrong_guesses
+    return stats
+
+
+def merge(total, stats):
+    for category, (games, wins, wrong) in stats.items():
+        row = total.setdefault(category, [0, 0, 0])
+        row[0] += games
+        row[1] += wins
+        row[2] += wrong
+
+
+def simulate(games, strategy="frequency", workers=None, seed=0, chunk_size=10000, words=WORDS_DIR, max_wrong=7):
+    chunks = [(seed, i, min(chunk_size, games - start)) for i, start in enumerate(range(0, games, chunk_size))]
+    total = {}
+    if workers == 1:
+        _init_worker(words, strategy, max_wrong)
+        for chunk in chunks:
+            merge(total, run_chunk(chunk))
+    else:
+        # Fail fast here instead of in every (re)spawned worker
+        load_strategy(strategy, load_word_bank(words))
+        with Pool(workers, initializer=_init_worker, initargs=(words, strategy, max_wrong)) as pool:
+            for stats in pool.imap_unordered(run_chunk, chunks):
+                merge(total, stats)
+    return total
+
+
+def summarize(total):
+    def row(games, wins, wrong):
+        n = max(games, 1)  # no games: rates of 0
+        return {"games": games, "win_rate": wins / n, "mean_wrong": wrong / n}
+
+    games = sum(r[0] for r in total.values())
+    wins = sum(r[1] for r in total.values())
+    wrong = sum(r[2] for r in total.values())
+    summary = row(games, wins, wrong)
+    summary["categories"] = {name: row(*total[name]) for name in sorted(total)}
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate Snowman games headlessly.")
+    parser.add_argument("-n", "--games", type=int, default=100000)
+    parser.add_argument("-s", "--strategy", default="frequency",
+                        help="random, frequency, solver or module:function")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--words", default=WORDS_DIR, help="words directory or compiled word bank")
+    parser.add_argument("--max-wrong", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    total = simulate(args.games, args.strategy, args.workers, args.seed, args.chunk_size, args.words, args.max_wrong)
+    elapsed = time.perf_counter() - start
+    summary = summarize(total)
+    summary["seconds"] = elapsed
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"{summary['games']} games with '{args.strategy}' in {elapsed:.2f}s "
+          f"({summary['games'] / elapsed:,.0f} games/s)")
+    print(f"Win rate: {summary['win_rate']:.2%}   Mean wrong guesses: {summary['mean_wrong']:.2f}")
+    for name, row in summary["categories"].items():
+        print(f"  {name:<22} {row['games']:>10}  win {row['win_rate']:7.2%}  wrong {row['mean_wrong']:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+import numpy as np
+
+HIDDEN = '_'
+
+
+class LengthGroup:
+    def __init__(self, words, codes, masks):
+        self.words = words
+        self.codes = codes
+        self.masks = masks
+
+
+class CategoryCodes:
+    # A category's words as small integer codes, grouped by length. Letters
+    # of the category's alphabet (any case or accented form) code as their
+    # index; every other character gets its own code from `letters` up.
+    def __init__(self, words, alphabet):
+        self.alphabet = alphabet
+        self.letters = len(alphabet.letters)
+        self.others = {}
+        self.bits = np.zeros(256, dtype=np.uint64)
+        self.bits[:self.letters] = np.left_shift(np.uint64(1), np.arange(self.letters, dtype=np.uint64))
+
+        by_length = {}
+        for word in words:
+            by_length.setdefault(len(word), []).append(word)
+        self.groups = {}
+        for length, group in by_length.items():
+            codes = self.encode(group).reshape(len(group), -1)
+            self.groups[length] = LengthGroup(group, codes, np.bitwise_or.reduce(self.bits[codes], axis=1))
+
+    def code(self, ch):
+        letter = self.alphabet.codes.get(ord(ch))
+        if letter is not None:
+            return letter
+        code = self.others.get(ch)
+        if code is None:
+            code = self.others[ch] = min(self.letters + len(self.others), 255)  # 255 is shared on overflow
+        return code
+
+    def encode(self, words):
+        raw = np.frombuffer(''.join(words).encode('utf-32-le'), dtype=np.uint32)
+        if not len(raw):
+            return np.zeros(0, dtype=np.uint8)
+        if raw.max() < 256:
+            # Latin-1 text: a table over the code points that occur
+            table = np.zeros(256, dtype=np.uint8)
+            for c in np.flatnonzero(np.bincount(raw, minlength=256)).tolist():
+                table[c] = self.code(chr(c))
+            return table[raw]
+        chars, inverse = np.unique(raw, return_inverse=True)
+        return np.array([self.code(chr(c)) for c in chars.tolist()], dtype=np.uint8)[inverse]
+
+
+def encode_category(words, alphabet):
+    return CategoryCodes(words, alphabet)
+
+
+class Solver:
+    def __init__(self, word_bank, book=None):
+        self.word_bank = word_bank
+        self.book = book  # game_openings.OpeningBook for early moves, optional
+        self._categories = {}
+
+    def codes(self, category):
+        codes = self._categories.get(category)
+        if codes is None:
+            codes = self._categories[category] = encode_category(self.word_bank[category],
+                                                                 self.word_bank.alphabet(category))
+        return codes
+
+    def filter(self, category, pattern, wrong_letters):
+        codes = self.codes(category)
+        group = codes.groups.get(len(pattern))
+        if group is None:
+            return None, np.empty(0, dtype=np.intp)
+
+        alphabet = codes.alphabet
+        revealed = alphabet.letters_mask(pattern)
+        wrong = alphabet.letters_mask(wrong_letters)
+
+        # Cheap whole-word rejection on the letter masks first
+        masks = group.masks
+        keep = (masks & np.uint64(wrong)) == 0
+        if revealed:
+            keep &= (masks & np.uint64(revealed)) == revealed
+        idx = np.flatnonzero(keep)
+
+        # then narrow column by column on the shown positions
+        hidden = []
+        for i, ch in enumerate(pattern):
+            if ch == HIDDEN:
+                hidden.append(i)
+            else:
+                idx = idx[group.codes[idx, i] == codes.code(ch)]
+
+        if hidden and len(idx):
+            # A hidden position holds a letter, and never one already revealed
+            hidden_codes = group.codes[idx][:, hidden]
+            ok = hidden_codes < codes.letters
+            if revealed:
+                ok &= (codes.bits[hidden_codes] & np.uint64(revealed)) == 0
+            idx = idx[ok.all(axis=1)]
+        return group, idx
+
+    def candidates(self, category, pattern, wrong_letters=()):
+        group, idx = self.filter(category, pattern, wrong_letters)
+        if group is None:
+            return []
+        return [group.words[i] for i in idx]
+
+    def letter_scores(self, category, pattern, wrong_letters=()):
+        # Returns (expected information gain in bits, candidates containing
+        # the letter) for every letter of the category's alphabet.
+        category_codes = self.codes(category)
+        alphabet, other = category_codes.alphabet, category_codes.letters
+        entropy = np.zeros(other)
+        counts = np.zeros(other, dtype=np.int64)
+        group, idx = self.filter(category, pattern, wrong_letters)
+        m = len(idx)
+        if m == 0:
+            return entropy, counts
+
+        codes = np.minimum(group.codes[idx], other)  # all non-letters in one column
+        masks = group.masks[idx]
+        for i in range(other):
+            counts[i] = np.count_nonzero(masks & category_codes.bits[i])
+
+        guessed = alphabet.letters_mask(pattern) | alphabet.letters_mask(wrong_letters)
+        open_letters = [i for i in range(other) if counts[i] and not guessed >> i & 1]
+        if not open_letters:
+            return entropy, counts
+
+        # Key each candidate by the positions every letter occupies in it
+        # (16-bit keys let numpy use a radix sort below)
+        length = codes.shape[1]
+        key_type = np.uint16 if length <= 16 else np.uint32 if length <= 32 else np.uint64
+        keys = np.zeros((m, other + 1), dtype=key_type)
+        rows = np.arange(m)
+        for pos in range(length):
+            keys[rows, codes[:, pos]] |= key_type(1 << pos)
+
+        # The partition of the candidates induced by a letter is the set of
+        # runs in its sorted key column; its entropy is the expected gain.
+        k = len(open_letters)
+        ordered = np.sort(keys[:, open_letters].T, axis=1, kind='stable')
+        change = np.empty((k, m), dtype=bool)
+        change[:, 0] = True
+        np.not_equal(ordered[:, 1:], ordered[:, :-1], out=change[:, 1:])
+        starts = np.flatnonzero(change)
+        sizes = np.diff(np.append(starts, k * m))
+        p = sizes / m
+        entropy[open_letters] = np.bincount(starts // m, weights=-p * np.log2(p), minlength=k)
+        return entropy, counts
+
+    def best_letter(self, category, pattern, wrong_letters=()):
+        alphabet = self.word_bank.alphabet(category)
+        guessed = alphabet.letters_mask(pattern) | alphabet.letters_mask(wrong_letters)
+        if self.book is not None:
+            found, letter = self.book.lookup(category, pattern, guessed)
+            if found:
+                return letter
+        entropy, counts = self.letter_scores(category, pattern, wrong_letters)
+        return pick_letter(entropy, counts, guessed, alphabet.letters)
+
+
+def pick_letter(entropy, counts, guessed, letters):
+    # Highest expected gain, ties broken by how many candidates contain it
+    best = None
+    for i in range(len(letters)):
+        if guessed >> i & 1:
+            continue
+        score = (entropy[i], counts[i])
+        if best is None or score > best[0]:
+            best = (score, i)
+    if best is None:
+        return None
+    return letters[best[1]]
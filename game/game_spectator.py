@@ -0,0 +1,132 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+from game_engine import GameEngine, PLAYING
+from game_simulate import load_strategy
+from game_words import WORDS_DIR, load_word_bank
+
+
+class BotBoards:
+    # Games played by a strategy for the spectator grid. Each board guesses
+    # every guess_ms on average, and a finished board starts a new game
+    # after pause_ms.
+    def __init__(self, word_bank, count, strategy="frequency", guess_ms=1000, pause_ms=3000, seed=None):
+        self.rng = random.Random(seed)
+        self.strategy = load_strategy(strategy, word_bank)
+        self.engines = [GameEngine(word_bank) for _ in range(count)]
+        self.guess_ms = guess_ms
+        self.pause_ms = pause_ms
+        self.next_move = [0.0] * count
+        self.now = 0.0
+        for i, engine in enumerate(self.engines):
+            engine.new_game(self.rng.getrandbits(64))
+            self.next_move[i] = self.rng.uniform(0, guess_ms)
+
+    def step(self, elapsed_ms):
+        # Advances the clock; returns the boards that changed
+        self.now += elapsed_ms
+        changed = []
+        rng = self.rng
+        for i, due in enumerate(self.next_move):
+            if due > self.now:
+                continue
+            engine = self.engines[i]
+            if engine.status == PLAYING:
+                engine.guess(self.strategy(engine, rng))
+                wait = self.pause_ms if engine.status != PLAYING else rng.uniform(0.5, 1.5) * self.guess_ms
+            else:
+                engine.new_game(rng.getrandbits(64))
+                wait = rng.uniform(0.5, 1.5) * self.guess_ms
+            self.next_move[i] = self.now + wait
+            changed.append(i)
+        return changed
+
+    def show(self, grid, boards):
+        for i in boards:
+            engine = self.engines[i]
+            grid.set_board(i, engine.pattern, engine.wrong_guesses, engine.status)
+
+
+def bench(grid, bots, seconds):
+    # Plays `seconds` of games frame by frame on a virtual clock, timing the
+    # bot moves and the repaint of each frame
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance()
+    frame_ms = grid.frame_ms
+    times = []
+    for _ in range(int(seconds * 1000 / frame_ms)):
+        start = time.perf_counter()
+        bots.show(grid, bots.step(frame_ms))
+        grid.flush()
+        app.processEvents()
+        times.append(time.perf_counter() - start)
+    times.sort()
+    return {
+        "frames": len(times),
+        "mean_ms": sum(times) / len(times) * 1000,
+        "p99_ms": times[int(len(times) * 0.99)] * 1000,
+        "max_ms": times[-1] * 1000,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch many bot games at once in a spectator grid.")
+    parser.add_argument("-n", "--boards", type=int, default=500)
+    parser.add_argument("-s", "--strategy", default="frequency",
+                        help="random, frequency, solver or module:function")
+    parser.add_argument("--words", default=WORDS_DIR, help="words directory or compiled word bank")
+    parser.add_argument("--guess-ms", type=int, default=1000, help="mean time between a board's guesses")
+    parser.add_argument("--cell", default="80x100", help="cell size, WIDTHxHEIGHT")
+    parser.add_argument("--size", default="1920x1080", help="window size, WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--bench", type=float, metavar="SECONDS",
+                        help="play SECONDS of frames offscreen as fast as possible and print frame times")
+    args = parser.parse_args(argv)
+
+    if args.bench is not None:
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication, QScrollArea
+    from PyQt5.QtCore import QSize, QTimer, QElapsedTimer
+    from game_frontend import SpectatorGrid
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    bots = BotBoards(load_word_bank(args.words), args.boards, args.strategy, args.guess_ms, seed=args.seed)
+    grid = SpectatorGrid(args.boards, QSize(*map(int, args.cell.split("x"))))
+    bots.show(grid, range(args.boards))
+    window = QScrollArea()
+    window.setWindowTitle(f"Snowman - {args.boards} games")
+    window.setWidget(grid)
+    window.setWidgetResizable(True)
+    window.resize(*map(int, args.size.split("x")))
+    window.show()
+    app.processEvents()
+
+    if args.bench is not None:
+        result = bench(grid, bots, args.bench)
+        print(f"{result['frames']} frames, {args.boards} boards: mean {result['mean_ms']:.2f} ms, "
+              f"p99 {result['p99_ms']:.2f} ms, max {result['max_ms']:.2f} ms "
+              f"(budget {1000 / 60:.1f} ms at 60 fps)")
+        return 0
+
+    # One timer drives every board; the grid batches the repaints
+    clock = QElapsedTimer()
+    clock.start()
+    last = 0
+
+    def tick():
+        nonlocal last
+        now = clock.elapsed()
+        bots.show(grid, bots.step(now - last))
+        last = now
+
+    timer = QTimer(window)
+    timer.timeout.connect(tick)
+    timer.start(grid.frame_ms)
+    return app.exec_()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import time
+from array import array
+
+import numpy as np
+
+from game_engine import (
+    HIDDEN, index_word,
+    PLAYING, WON, LOST, INVALID, REPEAT, CORRECT, WRONG, FINISHED,
+)
+
+# Per-session columns (struct of arrays), ~37 bytes per game:
+#   word     u32  word id in the word bank
+#   required u64  letters that must be guessed to win
+#   guessed  u64  guessed letters
+#   language u8   index of the word's alphabet in SessionStore.alphabets
+#   wrong    u8   wrong guesses
+#   status   u8   status code (FREE for unused slots)
+#   gen      u16  slot generation, bumped on release so stale ids are rejected
+#   seen     u32  last use, whole seconds since the store was created
+#   started  u32  creation time, same clock as seen
+#   player   u32  caller-assigned player number (e.g. an interned name)
+STATUS_NAMES = (PLAYING, WON, LOST)
+S_PLAYING, S_WON, S_LOST, S_FREE = range(4)
+
+OUTCOME_NAMES = (INVALID, REPEAT, CORRECT, WRONG, FINISHED)
+O_INVALID, O_REPEAT, O_CORRECT, O_WRONG, O_FINISHED = range(5)
+
+_COLUMNS = (
+    ("word", "I", np.uint32),
+    ("required", "Q", np.uint64),
+    ("guessed", "Q", np.uint64),
+    ("language", "B", np.uint8),
+    ("wrong", "B", np.uint8),
+    ("status", "B", np.uint8),
+    ("gen", "H", np.uint16),
+    ("seen", "I", np.uint32),
+    ("started", "I", np.uint32),
+    ("player", "I", np.uint32),
+)
+
+
+class StaleSession(KeyError):
+    pass
+
+
+class SessionStore:
+    def __init__(self, word_bank, max_wrong=7):
+        self.word_bank = word_bank
+        self.max_wrong = max_wrong
+        self.epoch = time.monotonic()
+        for name, code, _ in _COLUMNS:
+            setattr(self, name, array(code))
+        self.free = array("I")
+        self.active = 0
+        self.alphabets = []  # every alphabet a session has used, indexed by the language column
+
+    def now(self):
+        return int(time.monotonic() - self.epoch)
+
+    # Session ids pack (generation, slot) so a reused slot gets a new id
+    def _slot(self, session_id):
+        slot = session_id & 0xFFFFFFFF
+        if not 0 <= slot < len(self.status) or self.status[slot] == S_FREE or self.gen[slot] != session_id >> 32:
+            raise StaleSession(session_id)
+        return slot
+
+    def _language(self, alphabet):
+        try:
+            return self.alphabets.index(alphabet)
+        except ValueError:
+            self.alphabets.append(alphabet)
+            return len(self.alphabets) - 1
+
+    def create(self, word_id, player=0):
+        category, word = self.word_bank.from_word_id(word_id)
+        alphabet = self.word_bank.alphabet(category)
+        required = index_word(word, alphabet).required
+        language = self._language(alphabet)
+        now = self.now()
+        if self.free:
+            slot = self.free.pop()
+            self.word[slot] = word_id
+            self.required[slot] = required
+            self.guessed[slot] = 0
+            self.language[slot] = language
+            self.wrong[slot] = 0
+            self.status[slot] = S_PLAYING
+            self.seen[slot] = now
+            self.started[slot] = now
+            self.player[slot] = player
+        else:
+            slot = len(self.status)
+            self.word.append(word_id)
+            self.required.append(required)
+            self.guessed.append(0)
+            self.language.append(language)
+            self.wrong.append(0)
+            self.status.append(S_PLAYING)
+            self.gen.append(0)
+            self.seen.append(now)
+            self.started.append(now)
+            self.player.append(player)
+        self.active += 1
+        return self.gen[slot] << 32 | slot
+
+    def release(self, session_id):
+        slot = self._slot(session_id)
+        self._release(slot)
+
+    def _release(self, slot):
+        self.status[slot] = S_FREE
+        self.gen[slot] = (self.gen[slot] + 1) & 0xFFFF
+        self.free.append(slot)
+        self.active -= 1
+
+    def __len__(self):
+        return self.active
+
+    def __contains__(self, session_id):
+        try:
+            self._slot(session_id)
+        except StaleSession:
+            return False
+        return True
+
+    def guess(self, session_id, letter):
+        slot = self._slot(session_id)
+        self.seen[slot] = self.now()
+        if self.status[slot] != S_PLAYING:
+            return FINISHED
+
+        entry = self.alphabets[self.language[slot]].lookup.get(letter)
+        if entry is None:
+            return INVALID
+        bit = entry[1]
+
+        guessed = self.guessed[slot]
+        if guessed & bit:
+            return REPEAT
+        guessed |= bit
+        self.guessed[slot] = guessed
+
+        required = self.required[slot]
+        if required & bit:
+            if required & ~guessed == 0:
+                self.status[slot] = S_WON
+            return CORRECT
+
+        wrong = self.wrong[slot] + 1
+        self.wrong[slot] = wrong
+        if wrong >= self.max_wrong:
+            self.status[slot] = S_LOST
+        return WRONG
+
+    def state(self, session_id):
+        slot = self._slot(session_id)
+        category, word = self.word_bank.from_word_id(self.word[slot])
+        guessed = self.guessed[slot]
+        alphabet = self.alphabets[self.language[slot]]
+        lookup = alphabet.lookup
+        pattern = []
+        for ch in word:
+            entry = lookup.get(ch)
+            pattern.append(HIDDEN if entry is not None and not entry[1] & guessed else ch)
+        pattern = ''.join(pattern).translate(alphabet.folds)
+        return {
+            "category": category,
+            "word": word,
+            "pattern": pattern,
+            "wrong": self.wrong[slot],
+            "status": STATUS_NAMES[self.status[slot]],
+            "player": self.player[slot],
+            "seconds": self.seen[slot] - self.started[slot],
+        }
+
+    def columns(self):
+        # Zero-copy NumPy views of the columns. Release them before the
+        # store grows again (array cannot resize while a view is alive).
+        return {name: np.frombuffer(getattr(self, name), dtype=dtype) for name, _, dtype in _COLUMNS}
+
+    def apply_guess(self, session_ids, letter):
+        # Applies the same guess to every session in the batch at once and
+        # returns an array of outcome codes (see OUTCOME_NAMES). Session ids
+        # in a batch must be unique.
+        session_ids = np.asarray(session_ids, dtype=np.uint64)
+        # The letter's bit in each alphabet; 0 where it is not a letter
+        bits = np.array([alphabet.lookup.get(letter, (None, 0))[1] for alphabet in self.alphabets] or [0],
+                        dtype=np.uint64)
+        outcomes = np.full(len(session_ids), O_INVALID, dtype=np.uint8)
+        if not len(session_ids):
+            return outcomes
+
+        cols = self.columns()
+        slots = (session_ids & np.uint64(0xFFFFFFFF)).astype(np.intp)
+        if (slots >= len(cols["status"])).any():
+            raise StaleSession("session id out of range")
+        status = cols["status"][slots]
+        if ((status == S_FREE) | (cols["gen"][slots] != (session_ids >> np.uint64(32)))).any():
+            raise StaleSession("batch contains released sessions")
+
+        guessed = cols["guessed"][slots]
+        required = cols["required"][slots]
+        wrong = cols["wrong"][slots]
+        bit = bits[cols["language"][slots]]
+        valid = bit != 0
+
+        playing = status == S_PLAYING
+        fresh = playing & valid & ((guessed & bit) == 0)
+        hit = fresh & ((required & bit) != 0)
+        miss = fresh & ~hit
+
+        guessed[fresh] |= bit[fresh]
+        wrong[miss] += 1
+        status[hit & ((required & ~guessed) == 0)] = S_WON
+        status[miss & (wrong >= self.max_wrong)] = S_LOST
+
+        outcomes[:] = O_REPEAT
+        outcomes[~valid] = O_INVALID
+        outcomes[~playing] = O_FINISHED
+        outcomes[hit] = O_CORRECT
+        outcomes[miss] = O_WRONG
+
+        cols["guessed"][slots] = guessed
+        cols["wrong"][slots] = wrong
+        cols["status"][slots] = status
+        cols["seen"][slots] = self.now()
+        del cols
+        return outcomes
+
+    def evict_idle(self, max_idle):
+        # Releases every session unused for max_idle seconds; returns the count
+        deadline = self.now() - max_idle
+        if deadline <= 0:
+            return 0
+        cols = self.columns()
+        idle = np.flatnonzero((cols["status"] != S_FREE) & (cols["seen"] < deadline))
+        del cols
+        for slot in idle.tolist():
+            self._release(slot)
+        return len(idle)
+
+    def memory_per_session(self):
+        return sum(getattr(self, name).itemsize for name, _, _ in _COLUMNS)
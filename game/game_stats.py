@@ -0,0 +1,215 @@
+import argparse
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from game_engine import WON
+
+STATS_PATH = os.path.join(os.path.expanduser("~"), ".snowman_stats.db")
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS games (
+        id INTEGER PRIMARY KEY,
+        player TEXT NOT NULL,
+        category TEXT NOT NULL,
+        won INTEGER NOT NULL,
+        wrong INTEGER NOT NULL,
+        seconds REAL NOT NULL,
+        finished REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS player_totals (
+        player TEXT PRIMARY KEY,
+        games INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        wrong INTEGER NOT NULL,
+        seconds REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS player_totals_wins ON player_totals (wins DESC);
+    CREATE TABLE IF NOT EXISTS category_totals (
+        category TEXT PRIMARY KEY,
+        games INTEGER NOT NULL,
+        wins INTEGER NOT NULL,
+        wrong INTEGER NOT NULL,
+        seconds REAL NOT NULL
+    );
+"""
+
+# Rollups are bumped by each batch's totals in the same transaction as the
+# games themselves, so queries never need to scan the games table.
+_ROLLUP = """
+    INSERT INTO {table} ({key}, games, wins, wrong, seconds) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT ({key}) DO UPDATE SET
+        games = games + excluded.games,
+        wins = wins + excluded.wins,
+        wrong = wrong + excluded.wrong,
+        seconds = seconds + excluded.seconds
+"""
+
+_STOP = object()
+
+
+class StatsUnavailable(RuntimeError):
+    pass
+
+
+def connect(path):
+    db = sqlite3.connect(path, timeout=30)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    return db
+
+
+class StatsStore:
+    # Finished games go through a queue to one writer thread, which commits
+    # whatever has piled up (up to batch_size) in a single transaction.
+    # record() never touches the disk, so callers on the GUI thread or the
+    # server's event loop do not wait on it. Queries read the rollup tables
+    # on a connection of the calling thread; WAL lets them run during writes.
+    # If the database cannot be opened the writer stops, and record(),
+    # flush() and the queries raise StatsUnavailable.
+    def __init__(self, path=STATS_PATH, batch_size=512):
+        self.path = path
+        self.batch_size = batch_size
+        self.queue = queue.Queue()
+        self.readers = threading.local()
+        self.ready = threading.Event()  # set once the writer has created the schema, or failed to
+        self.error = None  # why the writer stopped, if it did
+        self.writer = threading.Thread(target=self._write_loop, name="stats-writer", daemon=True)
+        self.writer.start()
+
+    def _check(self):
+        if self.error is not None:
+            raise StatsUnavailable(f"stats database {self.path}: {self.error}")
+
+    def record(self, player, category, status, wrong, seconds, finished=None):
+        self._check()
+        self.queue.put((player, category, int(status == WON), wrong, seconds,
+                        time.time() if finished is None else finished))
+
+    def _write_loop(self):
+        try:
+            db = connect(self.path)
+            db.executescript(SCHEMA)
+        except sqlite3.Error as e:
+            self.error = e
+            return
+        finally:
+            self.ready.set()
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in batch
+            games = [game for game in batch if game is not _STOP]
+            if games:
+                try:
+                    self._write(db, games)
+                except sqlite3.Error as e:
+                    print(f"stats: dropped {len(games)} games: {e}", file=sys.stderr)
+            for _ in batch:
+                self.queue.task_done()
+            if stop:
+                db.close()
+                return
+
+    def _write(self, db, games):
+        players, categories = {}, {}
+        for player, category, won, wrong, seconds, _ in games:
+            for totals, key in ((players, player), (categories, category)):
+                row = totals.get(key)
+                if row is None:
+                    row = totals[key] = [0, 0, 0, 0.0]
+                row[0] += 1
+                row[1] += won
+                row[2] += wrong
+                row[3] += seconds
+        with db:
+            db.executemany("INSERT INTO games (player, category, won, wrong, seconds, finished) "
+                           "VALUES (?, ?, ?, ?, ?, ?)", games)
+            db.executemany(_ROLLUP.format(table="player_totals", key="player"),
+                           [(key, *row) for key, row in players.items()])
+            db.executemany(_ROLLUP.format(table="category_totals", key="category"),
+                           [(key, *row) for key, row in categories.items()])
+
+    def flush(self):
+        # Blocks until every game recorded so far is committed
+        self.ready.wait()
+        self._check()
+        self.queue.join()
+
+    def close(self):
+        self.ready.wait()
+        if self.error is None:
+            self.queue.put(_STOP)
+        self.writer.join()
+
+    def _reader(self):
+        db = getattr(self.readers, "db", None)
+        if db is None:
+            self.ready.wait()
+            self._check()
+            db = self.readers.db = connect(self.path)
+        return db
+
+    def leaderboard(self, limit=10, min_games=1):
+        rows = self._reader().execute(
+            "SELECT player, games, wins, CAST(wins AS REAL) / games, CAST(wrong AS REAL) / games "
+            "FROM player_totals WHERE games >= ? ORDER BY wins DESC, games ASC LIMIT ?",
+            (min_games, limit))
+        return [dict(zip(("player", "games", "wins", "win_rate", "mean_wrong"), row)) for row in rows]
+
+    def category_win_rates(self):
+        rows = self._reader().execute(
+            "SELECT category, games, CAST(wins AS REAL) / games, CAST(wrong AS REAL) / games, seconds / games "
+            "FROM category_totals ORDER BY category")
+        return {category: {"games": games, "win_rate": rate, "mean_wrong": wrong, "mean_seconds": seconds}
+                for category, games, rate, wrong, seconds in rows}
+
+    def rebuild_rollups(self):
+        # Recomputes both rollup tables from the games table
+        self.flush()
+        db = connect(self.path)
+        with db:
+            for table, key in (("player_totals", "player"), ("category_totals", "category")):
+                db.execute(f"DELETE FROM {table}")
+                db.execute(f"INSERT INTO {table} ({key}, games, wins, wrong, seconds) "
+                           f"SELECT {key}, COUNT(*), SUM(won), SUM(wrong), SUM(seconds) FROM games GROUP BY {key}")
+        db.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show the leaderboard and per-category win rates.")
+    parser.add_argument("--db", default=STATS_PATH)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--min-games", type=int, default=1)
+    parser.add_argument("--rebuild", action="store_true", help="recompute the rollup tables first")
+    args = parser.parse_args(argv)
+
+    stats = StatsStore(args.db)
+    try:
+        stats.flush()
+    except StatsUnavailable as e:
+        print(e, file=sys.stderr)
+        stats.close()
+        return 1
+    if args.rebuild:
+        stats.rebuild_rollups()
+    print("Leaderboard")
+    for i, row in enumerate(stats.leaderboard(args.top, args.min_games), 1):
+        print(f"  {i:>3}. {row['player']:<20} {row['wins']:>8} wins  {row['games']:>8} games  "
+              f"win {row['win_rate']:7.2%}  wrong {row['mean_wrong']:.2f}")
+    print("Categories")
+    for category, row in stats.category_win_rates().items():
+        print(f"  {category:<22} {row['games']:>8} games  win {row['win_rate']:7.2%}  "
+              f"wrong {row['mean_wrong']:.2f}  {row['mean_seconds']:.1f}s")
+    stats.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
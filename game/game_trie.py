@@ -0,0 +1,330 @@
+import mmap
+import struct
+import sys
+from array import array
+
+from game_alphabet import DEFAULT_LANGUAGE, get_alphabet
+from game_words import WordBank, load_word_bank
+
+# Packed DAWG word bank layout (little endian). Suffixes are shared between
+# all words of all categories, and every node records facts about the words
+# below it so queries can prune whole subtrees:
+#   header:   magic, category count (u32)
+#   per category: name length (u16), name (utf-8), root (u32 slot),
+#                 language (8 ascii bytes, zero padded)
+#   padding to a multiple of 4 bytes, then nodes as u32 slots:
+#     edge count | shortest suffix below << 16 | longest suffix below << 24
+#     letters contained in every suffix below | TERMINAL if a word ends here
+#     words below
+#     per edge: code point, child slot
+# A slot is a byte offset / 4. Children are always written before parents.
+# Nodes are shared between categories of every language, so the letter
+# masks are always over the English alphabet (accented forms folded).
+MAGIC = b"SNOWTRI2"
+_HEADER = struct.Struct("<8sI")
+_NAME_LEN = struct.Struct("<H")
+_ROOT = struct.Struct("<I8s")
+TERMINAL = 1 << 31
+HIDDEN = '_'
+MAX_LENGTH = 255
+MASK_LANGUAGE = "en"
+_LANE = 32  # bits per counter in the packed per-letter counts
+
+
+class _BuildNode:
+    __slots__ = ("terminal", "edges", "id")
+
+    def __init__(self):
+        self.terminal = False
+        self.edges = {}
+        self.id = None
+
+    def signature(self):
+        return self.terminal, tuple((ch, child.id) for ch, child in sorted(self.edges.items()))
+
+
+class _Builder:
+    # Incremental DAWG construction over sorted input (Daciuk et al. 2000):
+    # a suffix is merged with an equivalent registered one as soon as no
+    # later word can extend it.
+    def __init__(self):
+        self.register = {}
+        self.nodes = []
+
+    def add_words(self, words):
+        root = _BuildNode()
+        unchecked = []
+        previous = ""
+        for word in sorted(set(words)):
+            if len(word) > MAX_LENGTH:
+                raise ValueError(f"word longer than {MAX_LENGTH} characters: {word[:20]}...")
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            self._minimize(unchecked, common)
+            node = unchecked[-1][2] if unchecked else root
+            for ch in word[common:]:
+                child = _BuildNode()
+                node.edges[ch] = child
+                unchecked.append((node, ch, child))
+                node = child
+            node.terminal = True
+            previous = word
+        self._minimize(unchecked, 0)
+        self._register(root, force=True)
+        return root
+
+    def _minimize(self, unchecked, keep):
+        while len(unchecked) > keep:
+            parent, ch, child = unchecked.pop()
+            parent.edges[ch] = self._register(child)
+
+    def _register(self, node, force=False):
+        signature = node.signature()
+        existing = self.register.get(signature)
+        if existing is not None and not force:
+            return existing
+        node.id = len(self.nodes)
+        self.nodes.append(node)
+        if existing is None:
+            self.register[signature] = node
+        return node
+
+
+def save_trie(word_bank, path):
+    builder = _Builder()
+    roots = [(name, builder.add_words(words)) for name, words in word_bank.items()]
+    lookup = get_alphabet(MASK_LANGUAGE).lookup
+
+    names = [name.encode("utf-8") for name, _ in roots]
+    header = _HEADER.size + sum(_NAME_LEN.size + len(name) + _ROOT.size for name in names)
+    padding = -header % 4
+    slot = (header + padding) // 4
+    slots = []
+    facts = []
+    body = array("I")
+    for node in builder.nodes:
+        edges = sorted(node.edges.items())
+        count = int(node.terminal)
+        shortest, longest = (0, 0) if node.terminal else (MAX_LENGTH, 0)
+        every = None if not node.terminal else 0
+        for ch, child in edges:
+            c_count, c_short, c_long, c_every = facts[child.id]
+            count += c_count
+            shortest = min(shortest, c_short + 1)
+            longest = max(longest, c_long + 1)
+            mask = c_every | lookup.get(ch, (None, 0))[1]
+            every = mask if every is None else every & mask
+        every = every or 0
+        facts.append((count, shortest, longest, every))
+        slots.append(slot + len(body))
+        body.extend((len(edges) | shortest << 16 | longest << 24,
+                     every | (TERMINAL if node.terminal else 0),
+                     count))
+        for ch, child in edges:
+            body.extend((ord(ch), slots[child.id]))
+    if sys.byteorder != "little":
+        body.byteswap()
+
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(roots)))
+        for name, (category, root) in zip(names, roots):
+            language = word_bank.language(category).encode("ascii")
+            f.write(_NAME_LEN.pack(len(name)) + name + _ROOT.pack(slots[root.id], language))
+        f.write(bytes(padding))
+        body.tofile(f)
+    return len(builder.nodes), header + padding + 4 * len(body)
+
+
+class PackedTrie:
+    # Read-only sorted word set backed by a region of a packed DAWG buffer.
+    # Also a sequence (len, index, iterate) so it can stand in for a word list.
+    def __init__(self, slots, root, language=DEFAULT_LANGUAGE):
+        self._slots = slots
+        self._root = root
+        self.language = language
+        self.alphabet = get_alphabet(language)
+        # The node masks only prune queries whose letters they were built over
+        self._masks_apply = self.alphabet.letters == get_alphabet(MASK_LANGUAGE).letters
+
+    def __len__(self):
+        return self._slots[self._root + 2]
+
+    def __contains__(self, word):
+        slots = self._slots
+        node = self._root
+        for ch in word:
+            code = ord(ch)
+            for edge in range(node + 3, node + 3 + 2 * (slots[node] & 0xFFFF), 2):
+                if slots[edge] == code:
+                    node = slots[edge + 1]
+                    break
+            else:
+                return False
+        return bool(slots[node + 1] & TERMINAL)
+
+    def __getitem__(self, index):
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("word index out of range")
+        slots = self._slots
+        chars = []
+        node = self._root
+        while True:
+            if slots[node + 1] & TERMINAL:
+                if index == 0:
+                    return ''.join(chars)
+                index -= 1
+            for edge in range(node + 3, node + 3 + 2 * (slots[node] & 0xFFFF), 2):
+                child = slots[edge + 1]
+                below = slots[child + 2]
+                if index < below:
+                    chars.append(chr(slots[edge]))
+                    node = child
+                    break
+                index -= below
+
+    def __iter__(self):
+        slots = self._slots
+        stack = [(self._root, "")]
+        while stack:
+            node, prefix = stack.pop()
+            if slots[node + 1] & TERMINAL:
+                yield prefix
+            for edge in range(node + 1 + 2 * (slots[node] & 0xFFFF), node + 1, -2):
+                stack.append((slots[edge + 1], prefix + chr(slots[edge])))
+
+    def matches(self, pattern, excluded=()):
+        # Words fitting the pattern ('_' = hidden letter, letters compared
+        # after folding). A hidden position never holds a letter revealed
+        # elsewhere in the pattern, and no part of the word holds an
+        # excluded letter.
+        slots = self._slots
+        wanted, node_mask, blank_mask = self._query(pattern, excluded)
+        codes = self.alphabet.codes
+        length = len(pattern)
+        stack = [(self._root, 0, "")]
+        while stack:
+            node, depth, prefix = stack.pop()
+            head = slots[node]
+            remaining = length - depth
+            if not (head >> 16 & 0xFF) <= remaining <= head >> 24 or slots[node + 1] & node_mask:
+                continue
+            if remaining == 0:
+                if slots[node + 1] & TERMINAL:
+                    yield prefix
+                continue
+            want = wanted[depth]
+            for edge in range(node + 1 + 2 * (head & 0xFFFF), node + 1, -2):
+                code = slots[edge]
+                if _fits(code, want, codes, blank_mask):
+                    stack.append((slots[edge + 1], depth + 1, prefix + chr(code)))
+
+    def letter_counts(self, pattern, excluded=()):
+        # Returns (matching words, {letter: matching words containing it}).
+        # Results are shared between paths reaching the same node at the same
+        # depth, and the per-letter counters travel packed in one int (32
+        # bits each) so merging them is a single addition.
+        slots = self._slots
+        wanted, node_mask, blank_mask = self._query(pattern, excluded)
+        codes = self.alphabet.codes
+        length = len(pattern)
+        memo = {}
+        lane = (1 << _LANE) - 1
+
+        def count(node, depth):
+            key = node << 8 | depth
+            result = memo.get(key)
+            if result is not None:
+                return result
+            head = slots[node]
+            remaining = length - depth
+            total = counts = 0
+            if (head >> 16 & 0xFF) <= remaining <= head >> 24 and not slots[node + 1] & node_mask:
+                if remaining == 0:
+                    total = 1 if slots[node + 1] & TERMINAL else 0
+                else:
+                    want = wanted[depth]
+                    for edge in range(node + 3, node + 3 + 2 * (head & 0xFFFF), 2):
+                        code = slots[edge]
+                        if not _fits(code, want, codes, blank_mask):
+                            continue
+                        c_total, c_counts = count(slots[edge + 1], depth + 1)
+                        if not c_total:
+                            continue
+                        total += c_total
+                        counts += c_counts
+                        letter = codes.get(code)
+                        if letter is not None:
+                            # every word through this edge contains its letter
+                            shift = letter * _LANE
+                            counts += (c_total - (c_counts >> shift & lane)) << shift
+            result = memo[key] = (total, counts)
+            return result
+
+        total, counts = count(self._root, 0)
+        return total, {letter: counts >> (i * _LANE) & lane for i, letter in enumerate(self.alphabet.letters)}
+
+    def _query(self, pattern, excluded):
+        # Per position: None if hidden, the letter index wanted, or -1 minus
+        # the code point of a non-letter; then the excluded letters as a node
+        # mask (0 if the node masks do not apply) and the letters no hidden
+        # position may hold
+        alphabet = self.alphabet
+        wanted = []
+        for ch in pattern:
+            letter = alphabet.codes.get(ord(ch))
+            wanted.append(None if ch == HIDDEN else letter if letter is not None else -1 - ord(ch))
+        excluded_mask = alphabet.letters_mask(excluded)
+        blank_mask = excluded_mask | alphabet.letters_mask(pattern)
+        return wanted, excluded_mask if self._masks_apply else 0, blank_mask
+
+
+def _fits(code, want, codes, blank_mask):
+    letter = codes.get(code)
+    if want is None:
+        return letter is not None and not 1 << letter & blank_mask
+    if want >= 0:
+        return letter == want
+    return code == -1 - want
+
+
+def load_trie_bank(path):
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, count = _HEADER.unpack_from(buffer, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a packed trie word bank")
+
+    if sys.byteorder == "little":
+        slots = memoryview(buffer).cast("I")
+    else:
+        slots = array("I", bytes(buffer))
+        slots.byteswap()
+
+    pos = _HEADER.size
+    categories = {}
+    for _ in range(count):
+        (name_len,) = _NAME_LEN.unpack_from(buffer, pos)
+        pos += _NAME_LEN.size
+        name = buffer[pos:pos + name_len].decode("utf-8")
+        pos += name_len
+        root, language = _ROOT.unpack_from(buffer, pos)
+        pos += _ROOT.size
+        categories[name] = PackedTrie(slots, root, language.rstrip(b"\0").decode("ascii"))
+    return WordBank(categories)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python game_trie.py <words dir or .bin> <output .trie>")
+        sys.exit(1)
+    bank = load_word_bank(sys.argv[1])
+    words = sum(len(words) for _, words in bank.items())
+    nodes, size = save_trie(bank, sys.argv[2])
+    print(f"{words} words, {nodes} nodes, {size} bytes ({size / max(words, 1):.1f} bytes/word)")
@@ -0,0 +1,252 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+from bisect import bisect_right
+
+from game_alphabet import DEFAULT_LANGUAGE, get_alphabet
+
+WORDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "words")
+
+# Binary word bank layout (little endian):
+#   header:   magic, category count (u32)
+#   per category: name length (u16), name (utf-8), word count (u32),
+#                 offsets position (u64), blob position (u64),
+#                 language (8 ascii bytes, zero padded)
+#   per category: word end offsets (u32 * count), then the utf-8 word blob
+MAGIC = b"SNOWBNK2"
+_HEADER = struct.Struct("<8sI")
+_NAME_LEN = struct.Struct("<H")
+_ENTRY = struct.Struct("<IQQ8s")
+_OFFSET = struct.Struct("<I")
+
+
+class TextCategory:
+    # One word or phrase per line; blank lines and '#' comments are skipped,
+    # except a '# language: xx' line naming the alphabet (default English).
+    # The file is only read the first time the category is used.
+    def __init__(self, path):
+        self.path = path
+        self._words = None
+        self._language = DEFAULT_LANGUAGE
+
+    @property
+    def words(self):
+        if self._words is None:
+            words = []
+            with open(self.path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line.startswith("#"):
+                        key, _, value = line[1:].partition(":")
+                        if key.strip().lower() == "language":
+                            self._language = value.strip()
+                    elif line:
+                        words.append(line)
+            self._words = words
+        return self._words
+
+    @property
+    def language(self):
+        self.words
+        return self._language
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, index):
+        return self.words[index]
+
+    def __iter__(self):
+        return iter(self.words)
+
+
+class MappedCategory:
+    def __init__(self, buffer, count, offsets_pos, blob_pos, language=DEFAULT_LANGUAGE):
+        self.language = language
+        self._buffer = buffer
+        self._count = count
+        self._offsets_pos = offsets_pos
+        self._blob_pos = blob_pos
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("word index out of range")
+        end = _OFFSET.unpack_from(self._buffer, self._offsets_pos + 4 * index)[0]
+        start = _OFFSET.unpack_from(self._buffer, self._offsets_pos + 4 * (index - 1))[0] if index else 0
+        return self._buffer[self._blob_pos + start:self._blob_pos + end].decode("utf-8")
+
+    def __iter__(self):
+        start = 0
+        blob = self._blob_pos
+        for (end,) in _OFFSET.iter_unpack(self._buffer[self._offsets_pos:self._offsets_pos + 4 * self._count]):
+            yield self._buffer[blob + start:blob + end].decode("utf-8")
+            start = end
+
+
+class WordBank:
+    # Maps category name -> sequence of words. Sequences may be plain lists,
+    # lazily read text files or views into a memory-mapped binary file.
+    # Each category has a language (see game_alphabet), taken from
+    # `languages`, else from the sequence's `language`, else English.
+    def __init__(self, categories, languages=None):
+        self._categories = dict(categories)
+        self._names = list(self._categories)
+        self._languages = dict(languages or {})
+        self._first_ids = None
+        self._playable = None
+
+    @classmethod
+    def from_dict(cls, word_bank, languages=None):
+        return cls(word_bank, languages)
+
+    @classmethod
+    def from_directory(cls, path):
+        categories = {}
+        for name in sorted(os.listdir(path)):
+            stem, ext = os.path.splitext(name)
+            if ext == ".txt":
+                categories[stem] = TextCategory(os.path.join(path, name))
+        return cls(categories)
+
+    @classmethod
+    def from_binary(cls, path):
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, count = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a word bank file")
+
+        pos = _HEADER.size
+        categories = {}
+        for _ in range(count):
+            (name_len,) = _NAME_LEN.unpack_from(buffer, pos)
+            pos += _NAME_LEN.size
+            name = buffer[pos:pos + name_len].decode("utf-8")
+            pos += name_len
+            words, offsets_pos, blob_pos, language = _ENTRY.unpack_from(buffer, pos)
+            pos += _ENTRY.size
+            categories[name] = MappedCategory(buffer, words, offsets_pos, blob_pos,
+                                              language.rstrip(b"\0").decode("ascii"))
+        return cls(categories)
+
+    def __getitem__(self, category):
+        return self._categories[category]
+
+    def __contains__(self, category):
+        return category in self._categories
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+    def keys(self):
+        return list(self._names)
+
+    def items(self):
+        return [(name, self._categories[name]) for name in self._names]
+
+    def language(self, category):
+        language = self._languages.get(category)
+        if language is None:
+            language = getattr(self._categories[category], "language", DEFAULT_LANGUAGE)
+            self._languages[category] = language
+        return language
+
+    def alphabet(self, category):
+        return get_alphabet(self.language(category))
+
+    def playable(self):
+        # Categories with at least one word; a blank or comment-only word
+        # file gives an empty category that cannot start a game
+        if self._playable is None:
+            self._playable = [name for name in self._names if len(self._categories[name])]
+        return self._playable
+
+    def random_index(self, rng):
+        names = self.playable()
+        if not names:
+            raise ValueError("word bank has no words")
+        category = rng.choice(names)
+        return category, rng.randrange(len(self._categories[category]))
+
+    def random_word(self, rng):
+        category, index = self.random_index(rng)
+        return category, self._categories[category][index]
+
+    def fingerprint(self):
+        # Changes whenever a category, its language or any word in it changes
+        digest = hashlib.sha1()
+        for name in self._names:
+            digest.update(name.encode("utf-8") + b"\0" + self.language(name).encode("ascii") + b"\0")
+            for word in self._categories[name]:
+                digest.update(word.encode("utf-8") + b"\n")
+        return digest.hexdigest()
+
+    # Word ids number every word of the bank, category after category
+    def _word_ids(self):
+        if self._first_ids is None:
+            first, total = [], 0
+            for name in self._names:
+                first.append(total)
+                total += len(self._categories[name])
+            self._first_ids = first
+        return self._first_ids
+
+    def word_id(self, category, index):
+        return self._word_ids()[self._names.index(category)] + index
+
+    def from_word_id(self, word_id):
+        first = self._word_ids()
+        i = bisect_right(first, word_id) - 1
+        category = self._names[i]
+        return category, self._categories[category][word_id - first[i]]
+
+
+def load_word_bank(path=WORDS_DIR):
+    if os.path.isdir(path):
+        return WordBank.from_directory(path)
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+    if magic == b"SNOWTRI2":
+        from game_trie import load_trie_bank
+        return load_trie_bank(path)
+    return WordBank.from_binary(path)
+
+
+def save_binary(word_bank, path):
+    entries = []
+    for name, words in word_bank.items():
+        offsets = bytearray()
+        blob = bytearray()
+        for word in words:
+            blob += word.encode("utf-8")
+            offsets += _OFFSET.pack(len(blob))
+        language = word_bank.language(name).encode("ascii")
+        entries.append((name.encode("utf-8"), len(offsets) // 4, offsets, blob, language))
+
+    pos = _HEADER.size + sum(_NAME_LEN.size + len(entry[0]) + _ENTRY.size for entry in entries)
+    with open(path, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, len(entries)))
+        for name, count, offsets, blob, language in entries:
+            f.write(_NAME_LEN.pack(len(name)) + name + _ENTRY.pack(count, pos, pos + len(offsets), language))
+            pos += len(offsets) + len(blob)
+        for _, _, offsets, blob, _ in entries:
+            f.write(offsets)
+            f.write(blob)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python game_words.py <words dir> <output .bin>")
+        sys.exit(1)
+    save_binary(load_word_bank(sys.argv[1]), sys.argv[2])
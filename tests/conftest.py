@@ -0,0 +1,50 @@
+import os
+import random
+import shutil
+import sys
+
+import pytest
+
+# The game modules import each other by name, as when run from game/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "game"))
+
+from game_engine import GameEngine, PLAYING  # noqa: E402
+from game_words import WORDS_DIR, load_word_bank  # noqa: E402
+
+# Accented letters, ñ (a letter of its own in Spanish) and a phrase
+SPANISH = ["piñata", "café", "cafe", "jalapeño", "ñandú", "media luna", "niño", "sangría", "mañana", "pan",
+           "churro", "paella"]
+
+
+@pytest.fixture
+def words_dir(tmp_path):
+    # The shipped word files plus a Spanish category
+    path = tmp_path / "words"
+    shutil.copytree(WORDS_DIR, path)
+    (path / "Comidas.txt").write_text("# language: es\n" + "\n".join(SPANISH) + "\n", encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def word_bank(words_dir):
+    return load_word_bank(words_dir)
+
+
+@pytest.fixture
+def states(word_bank):
+    # (category, pattern, wrong letters) met while playing every word of the
+    # bank with a shuffled alphabet, after 0 to 5 guesses
+    rng = random.Random(0)
+    engine = GameEngine(word_bank, max_wrong=26)
+    found = set()
+    for category, words in word_bank.items():
+        letters = list(word_bank.alphabet(category).letters)
+        for word in words:
+            rng.shuffle(letters)
+            engine.start(category, word)
+            for letter in letters[:6]:
+                found.add((category, engine.pattern, tuple(engine.wrong_letters)))
+                if engine.status != PLAYING:
+                    break
+                engine.guess(letter)
+    return sorted(found)
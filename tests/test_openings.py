@@ -0,0 +1,49 @@
+from game_engine import GameEngine, PLAYING
+from game_openings import OpeningBook, build, load_book
+from game_solver import Solver
+from game_words import load_word_bank
+
+
+def test_book_matches_solver(words_dir, word_bank, states, tmp_path):
+    path = str(tmp_path / "openings.bin")
+    entries, size = build(words_dir, path, moves=2, workers=1)
+    book = load_book(word_bank, path)
+    assert book is not None
+    assert book.moves == 2 and entries > 0
+
+    plain, booked = Solver(word_bank), Solver(word_bank, book=book)
+    for category, pattern, wrong in states:
+        assert booked.best_letter(category, pattern, wrong) == plain.best_letter(category, pattern, wrong), \
+            (category, pattern, wrong)
+
+    # The solver's own first two moves are always in the book
+    engine = GameEngine(word_bank, max_wrong=26)
+    for category, words in word_bank.items():
+        alphabet = word_bank.alphabet(category)
+        for word in words:
+            engine.start(category, word)
+            for _ in range(2):
+                if engine.status != PLAYING or len(plain.candidates(category, engine.pattern,
+                                                                    engine.wrong_letters)) <= 1:
+                    break
+                guessed = alphabet.letters_mask(engine.pattern) | alphabet.letters_mask(engine.wrong_letters)
+                entry = book.entry(category, engine.pattern, guessed)
+                assert entry is not None, (category, engine.pattern, engine.wrong_letters)
+                assert entry[0] == plain.best_letter(category, engine.pattern, engine.wrong_letters)
+                engine.guess(entry[0])
+
+
+def test_book_is_ignored_for_other_words(words_dir, tmp_path):
+    path = str(tmp_path / "openings.bin")
+    build(words_dir, path, moves=1, workers=1)
+    with open(f"{words_dir}/Comidas.txt", "a", encoding="utf-8") as f:
+        f.write("tortilla\n")
+    assert OpeningBook.load(path).fingerprint != load_word_bank(words_dir).fingerprint()
+    assert load_book(load_word_bank(words_dir), path) is None
+
+
+def test_missing_or_foreign_book(word_bank, tmp_path):
+    assert load_book(word_bank, str(tmp_path / "missing.bin")) is None
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"NOTABOOK" + bytes(48))
+    assert load_book(word_bank, str(other)) is None
@@ -0,0 +1,139 @@
+import os
+import random
+
+from game_engine import GameEngine, PLAYING
+from game_evil import EvilEngine
+from game_replay import INDEX, _INDEX, GameLog, GameRecord, Recorder, Replayer
+
+
+def play_games(word_bank, count, seed=0):
+    # Real games with random guesses (some not letters), played to the end
+    # or cut short, as GameRecords
+    rng = random.Random(seed)
+    engines = {False: GameEngine(word_bank), True: EvilEngine(word_bank)}
+    categories = sorted(word_bank.playable())
+    records = []
+    for n in range(count):
+        evil = n % 3 == 2
+        category = "Comidas" if n % 4 == 0 else rng.choice(categories)
+        word = rng.choice(list(word_bank[category]))
+        engine = engines[evil]
+        engine.start(category, word)
+        letters = list(word_bank.alphabet(category).letters) + ["-", "ß", "ab"]
+        guesses = []
+        for _ in range(rng.randrange(1, 30)):
+            if engine.status != PLAYING:
+                break
+            guesses.append(rng.choice(letters))
+            engine.guess(guesses[-1])
+        records.append(GameRecord(rng.randrange(2 ** 64), category, word, guesses, engine.max_wrong, evil,
+                                  engine.status, engine.wrong_guesses))
+    return records
+
+
+def record_all(recorder, records):
+    for r in records:
+        recorder.record(r.seed, r.category, r.word, r.guesses, r.max_wrong, r.evil, r.status, r.wrong)
+
+
+def test_log_round_trip(word_bank, tmp_path):
+    path = str(tmp_path / "games.log")
+    records = play_games(word_bank, 10)
+    recorder = Recorder(path, index_every=3)
+    record_all(recorder, records)
+    recorder.file.flush()
+
+    # Three index blocks, then one game only found by scanning
+    log = GameLog(path)
+    assert len(log.unindexed) == 1
+    assert list(log) == records
+    assert [log[i] for i in range(len(records))] == records
+    log.close()
+
+    recorder.close()
+    log = GameLog(path)
+    assert log.unindexed == []
+    assert list(log) == records
+    assert log.end == os.path.getsize(path)
+    log.close()
+
+
+def test_log_reopen_appends(word_bank, tmp_path):
+    path = str(tmp_path / "games.log")
+    records = play_games(word_bank, 12)
+    for start, stop in ((0, 4), (4, 5), (5, 12)):
+        recorder = Recorder(path, index_every=3)
+        record_all(recorder, records[start:stop])
+        recorder.close()
+    log = GameLog(path)
+    assert list(log) == records
+    log.close()
+
+
+def test_torn_tail_is_replaced(word_bank, tmp_path):
+    path = str(tmp_path / "games.log")
+    records = play_games(word_bank, 8)
+    recorder = Recorder(path, index_every=3)
+    record_all(recorder, records[:7])
+    recorder.file.close()  # a crash: game 7 is not indexed
+    complete = os.path.getsize(path)
+    recorder = Recorder(path, index_every=3)
+    record_all(recorder, records[7:])
+    recorder.file.close()  # game 8 is the one cut short below
+
+    with open(path, "rb") as f:
+        data = f.read()
+
+    for cut in range(complete + 1, len(data)):
+        with open(path, "wb") as f:
+            f.write(data[:cut])
+        log = GameLog(path)
+        assert list(log) == records[:7]
+        assert log.end == complete
+        log.close()
+
+        recorder = Recorder(path, index_every=3)
+        record_all(recorder, records[7:])
+        recorder.close()
+        log = GameLog(path)
+        assert list(log) == records
+        log.close()
+
+
+def test_torn_index_block_is_replaced(word_bank, tmp_path):
+    path = str(tmp_path / "games.log")
+    records = play_games(word_bank, 5)
+    recorder = Recorder(path, index_every=3)
+    record_all(recorder, records[:4])
+    recorder.close()
+    size = os.path.getsize(path)
+
+    # An index block cut short before the header pointer was moved
+    with open(path, "ab") as f:
+        f.write(_INDEX.pack(INDEX, 4, 2, 0) + bytes(10))
+    log = GameLog(path)
+    assert list(log) == records[:4]
+    assert log.end == size
+    log.close()
+
+    recorder = Recorder(path, index_every=3)
+    record_all(recorder, records[4:])
+    recorder.close()
+    log = GameLog(path)
+    assert list(log) == records
+    log.close()
+
+
+def test_replay_reproduces_games(word_bank, tmp_path):
+    path = str(tmp_path / "games.log")
+    records = play_games(word_bank, 30, seed=1)
+    recorder = Recorder(path)
+    record_all(recorder, records)
+    recorder.close()
+
+    log = GameLog(path)
+    replayer = Replayer(word_bank)
+    for record in log:
+        engine = replayer.play(record)
+        assert (engine.status, engine.wrong_guesses) == (record.status, record.wrong), record
+    log.close()
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from game_state import OUTCOME_NAMES, SessionStore, StaleSession
+
+
+def test_batch_matches_single_guesses(word_bank):
+    # Two stores with the same sessions, one guessed a batch at a time and
+    # one session by session, must agree on every outcome and state
+    batch, single = SessionStore(word_bank), SessionStore(word_bank)
+    word_ids = [word_bank.word_id(category, i) for category, words in word_bank.items() for i in range(len(words))]
+    batch_ids = [batch.create(word_id) for word_id in word_ids]
+    single_ids = [single.create(word_id) for word_id in word_ids]
+
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyzñéÁ"
+    for guess in [rng.choice(letters) for _ in range(60)] + ["-", " ", "ab", "", "ß"]:
+        outcomes = [OUTCOME_NAMES[o] for o in batch.apply_guess(batch_ids, guess)]
+        assert outcomes == [single.guess(session_id, guess) for session_id in single_ids], guess
+    for b, s in zip(batch_ids, single_ids):
+        assert batch.state(b) == single.state(s)
+
+
+def test_stale_sessions_are_rejected(word_bank):
+    store = SessionStore(word_bank)
+    ids = [store.create(i) for i in range(3)]
+    store.release(ids[0])
+    reused = store.create(5)  # takes the freed slot under a new generation
+    assert reused != ids[0]
+    with pytest.raises(StaleSession):
+        store.guess(ids[0], "e")
+    with pytest.raises(StaleSession):
+        store.apply_guess(ids, "e")
+    with pytest.raises(StaleSession):
+        store.apply_guess(ids, "-")
@@ -0,0 +1,32 @@
+from game_solver import Solver
+from game_trie import save_trie
+from game_words import load_word_bank
+
+
+def test_trie_round_trip(word_bank, tmp_path):
+    path = str(tmp_path / "bank.trie")
+    save_trie(word_bank, path)
+    trie = load_word_bank(path)
+
+    assert trie.keys() == word_bank.keys()
+    for category, words in word_bank.items():
+        assert list(trie[category]) == sorted(set(words))
+        assert len(trie[category]) == len(set(words))
+        assert trie.language(category) == word_bank.language(category)
+
+
+def test_trie_matches_solver(word_bank, states, tmp_path):
+    path = str(tmp_path / "bank.trie")
+    save_trie(word_bank, path)
+    trie = load_word_bank(path)
+    solver = Solver(word_bank)
+
+    for category, pattern, wrong in states:
+        expected = solver.candidates(category, pattern, wrong)
+        assert sorted(trie[category].matches(pattern, wrong)) == sorted(expected), (category, pattern, wrong)
+
+        total, counts = trie[category].letter_counts(pattern, wrong)
+        _, scores = solver.letter_scores(category, pattern, wrong)
+        letters = word_bank.alphabet(category).letters
+        assert total == len(expected)
+        assert [counts[letter] for letter in letters] == scores.tolist(), (category, pattern, wrong)
@@ -0,0 +1,43 @@
+import pytest
+
+from game_words import WordBank, load_word_bank, save_binary
+
+
+def test_binary_round_trip(word_bank, tmp_path):
+    path = str(tmp_path / "bank.bin")
+    save_binary(word_bank, path)
+    loaded = load_word_bank(path)
+
+    assert loaded.keys() == word_bank.keys()
+    for category, words in word_bank.items():
+        assert list(loaded[category]) == list(words)
+        assert [loaded[category][i] for i in range(len(words))] == list(words)
+        assert loaded.language(category) == word_bank.language(category)
+    assert loaded.fingerprint() == word_bank.fingerprint()
+
+
+def test_text_category_language(word_bank):
+    assert word_bank.language("Comidas") == "es"
+    assert word_bank.language("Animals") == "en"
+    assert "ñ" in word_bank.alphabet("Comidas").letters
+
+
+def test_word_ids_round_trip(word_bank):
+    for category, words in word_bank.items():
+        for i, word in enumerate(words):
+            assert word_bank.from_word_id(word_bank.word_id(category, i)) == (category, word)
+
+
+def test_binary_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"NOTABANK" + bytes(16))
+    with pytest.raises(ValueError):
+        load_word_bank(str(path))
+
+
+def test_empty_categories_are_not_played(tmp_path):
+    bank = WordBank.from_dict({"Empty": [], "Full": ["snow"]})
+    assert bank.playable() == ["Full"]
+    binary = str(tmp_path / "bank.bin")
+    save_binary(bank, binary)
+    assert load_word_bank(binary).playable() == ["Full"]